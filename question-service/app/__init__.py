@@ -1,17 +1,25 @@
-"""AIQ Question Generation Service."""
-
-from app.arbiter import QuestionArbiter
-from app.arbiter_config import (
-    ArbiterConfig,
-    ArbiterConfigLoader,
-    ArbiterModel,
-    EvaluationCriteria,
-    get_arbiter_config,
-    initialize_arbiter_config,
-)
-from app.database import DatabaseService as QuestionDatabase
-from app.deduplicator import QuestionDeduplicator
-from app.pipeline import QuestionGenerationPipeline
+"""AIQ Question Generation Service.
+
+Public classes are loaded on first access, so importing a single submodule
+(e.g. app.models) does not pull in the LLM provider SDKs.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+if TYPE_CHECKING:
+    from app.arbiter import QuestionArbiter
+    from app.arbiter_config import (
+        ArbiterConfig,
+        ArbiterConfigLoader,
+        ArbiterModel,
+        EvaluationCriteria,
+        get_arbiter_config,
+        initialize_arbiter_config,
+    )
+    from app.database import DatabaseService as QuestionDatabase
+    from app.deduplicator import QuestionDeduplicator
+    from app.pipeline import QuestionGenerationPipeline
 
 __version__ = "0.1.0"
 
@@ -27,3 +35,39 @@ __all__ = [
     "QuestionDeduplicator",
     "QuestionGenerationPipeline",
 ]
+
+# Public name -> (module, attribute) for lazily loaded exports
+_LAZY_EXPORTS: Dict[str, Tuple[str, str]] = {
+    "ArbiterConfig": ("app.arbiter_config", "ArbiterConfig"),
+    "ArbiterConfigLoader": ("app.arbiter_config", "ArbiterConfigLoader"),
+    "ArbiterModel": ("app.arbiter_config", "ArbiterModel"),
+    "EvaluationCriteria": ("app.arbiter_config", "EvaluationCriteria"),
+    "get_arbiter_config": ("app.arbiter_config", "get_arbiter_config"),
+    "initialize_arbiter_config": ("app.arbiter_config", "initialize_arbiter_config"),
+    "QuestionArbiter": ("app.arbiter", "QuestionArbiter"),
+    "QuestionDatabase": ("app.database", "DatabaseService"),
+    "QuestionDeduplicator": ("app.deduplicator", "QuestionDeduplicator"),
+    "QuestionGenerationPipeline": ("app.pipeline", "QuestionGenerationPipeline"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Load a public export on first access.
+
+    Args:
+        name: Attribute name
+
+    Returns:
+        The exported class or function
+
+    Raises:
+        AttributeError: If name is not an export of this package
+    """
+    try:
+        module_name, attr = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name), attr)
+    globals()[name] = value
+    return value
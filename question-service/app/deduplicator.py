@@ -4,8 +4,12 @@ This module provides functionality to detect duplicate questions using both
 exact match checking and semantic similarity analysis via embeddings.
 """
 
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import re
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
 
 import numpy as np
 from openai import OpenAI
@@ -14,6 +18,17 @@ from .models import GeneratedQuestion
 
 logger = logging.getLogger(__name__)
 
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# OpenAI embeddings API limits per request: inputs, and total tokens (kept
+# below the documented 300k cap since token counts are only estimated)
+MAX_EMBEDDING_BATCH_SIZE = 2048
+MAX_EMBEDDING_BATCH_TOKENS = 250_000
+
+# Rows of the int8 existing matrix converted to float32 at a time, small
+# enough for the converted block to stay in CPU cache
+_SIMILARITY_BLOCK_ROWS = 128
+
 
 class DuplicateCheckResult:
     """Result of a duplicate check operation.
@@ -68,6 +83,9 @@ class QuestionDeduplicator:
         openai_api_key: str,
         similarity_threshold: float = 0.85,
         embedding_model: str = "text-embedding-3-small",
+        embedding_cache_size: int = 10000,
+        quantize_embeddings: bool = False,
+        lexical_prefilter_threshold: Optional[float] = None,
     ):
         """Initialize the question deduplicator.
 
@@ -75,24 +93,72 @@ class QuestionDeduplicator:
             openai_api_key: OpenAI API key for embeddings
             similarity_threshold: Threshold for semantic similarity (0.0-1.0)
             embedding_model: OpenAI embedding model to use
+            embedding_cache_size: Maximum number of embeddings kept in memory
+                                  (0 disables caching)
+            quantize_embeddings: Store existing question embeddings as int8 with
+                                 per-row scales instead of float32, and keep
+                                 them out of the embedding cache, to reduce
+                                 memory for large question pools
+            lexical_prefilter_threshold: If set, skip the semantic check for
+                                         questions whose token-set Jaccard
+                                         similarity to every existing question
+                                         is below this value (0.0-1.0)
 
         Raises:
-            ValueError: If similarity_threshold is not between 0 and 1
+            ValueError: If similarity_threshold or lexical_prefilter_threshold
+                        is not between 0 and 1
         """
         if not 0.0 <= similarity_threshold <= 1.0:
             raise ValueError(
                 f"similarity_threshold must be between 0.0 and 1.0, got {similarity_threshold}"
             )
+        if lexical_prefilter_threshold is not None and not (
+            0.0 <= lexical_prefilter_threshold <= 1.0
+        ):
+            raise ValueError(
+                "lexical_prefilter_threshold must be between 0.0 and 1.0, "
+                f"got {lexical_prefilter_threshold}"
+            )
 
-        self.openai_client = OpenAI(api_key=openai_api_key)
+        self._openai_api_key = openai_api_key
         self.similarity_threshold = similarity_threshold
         self.embedding_model = embedding_model
 
+        # Row-normalized embedding matrix of the most recently seen existing
+        # questions, reused across check_duplicate calls against the same list
+        self._existing_key: Optional[Tuple[str, ...]] = None
+        self._existing_rows: List[Dict[str, Any]] = []
+        self._existing_matrix: Optional[np.ndarray] = None
+        self._existing_scales: Optional[np.ndarray] = None
+        self.quantize_embeddings = quantize_embeddings
+
+        # Inverted token index of the most recently seen existing questions,
+        # used by the optional lexical prefilter
+        self.lexical_prefilter_threshold = lexical_prefilter_threshold
+        self._token_index_key: Optional[Tuple[str, ...]] = None
+        self._token_sets: List[frozenset] = []
+        self._token_index: Dict[str, List[int]] = {}
+
+        # LRU cache of embeddings keyed by (model, sha256 of text)
+        self.embedding_cache_size = embedding_cache_size
+        self._embedding_cache: "OrderedDict[Tuple[str, str], np.ndarray]" = (
+            OrderedDict()
+        )
+
         logger.info(
             f"QuestionDeduplicator initialized with threshold={similarity_threshold}, "
             f"model={embedding_model}"
         )
 
+    @cached_property
+    def openai_client(self) -> OpenAI:
+        """OpenAI client for embeddings, created on first use.
+
+        Returns:
+            OpenAI client configured with the deduplicator's API key
+        """
+        return OpenAI(api_key=self._openai_api_key)
+
     def check_duplicate(
         self,
         question: GeneratedQuestion,
@@ -111,32 +177,7 @@ class QuestionDeduplicator:
         Raises:
             Exception: If embedding generation fails
         """
-        question_text = question.question_text.strip().lower()
-
-        # Step 1: Check for exact match (case-insensitive)
-        for existing in existing_questions:
-            existing_text = existing.get("question_text", "").strip().lower()
-            if question_text == existing_text:
-                logger.info(f"Exact duplicate found for: {question_text[:50]}...")
-                return DuplicateCheckResult(
-                    is_duplicate=True,
-                    duplicate_type="exact",
-                    similarity_score=1.0,
-                    matched_question=existing,
-                )
-
-        # Step 2: Check for semantic similarity using embeddings
-        if len(existing_questions) > 0:
-            result = self._check_semantic_similarity(question_text, existing_questions)
-            if result.is_duplicate:
-                logger.info(
-                    f"Semantic duplicate found with score {result.similarity_score:.3f}"
-                )
-                return result
-
-        # No duplicate found
-        logger.debug(f"No duplicate found for: {question_text[:50]}...")
-        return DuplicateCheckResult(is_duplicate=False)
+        return self._check_duplicates([question.question_text], existing_questions)[0]
 
     def check_duplicates_batch(
         self,
@@ -145,90 +186,335 @@ class QuestionDeduplicator:
     ) -> List[DuplicateCheckResult]:
         """Check multiple questions for duplicates.
 
+        Embeddings for the whole batch are requested together, in as few API
+        calls as the request limits allow. If embedding fails, questions
+        without an exact match are reported as non-duplicates rather than
+        blocking the batch.
+
         Args:
             questions: List of generated questions to check
             existing_questions: List of existing question data
 
         Returns:
             List of DuplicateCheckResult, one per input question
+        """
+        return self.check_duplicates_batch_texts(
+            [q.question_text for q in questions], existing_questions
+        )
 
-        Raises:
-            Exception: If any check fails
+    def check_duplicates_batch_texts(
+        self,
+        question_texts: List[str],
+        existing_questions: List[Dict[str, Any]],
+    ) -> List[DuplicateCheckResult]:
+        """Check multiple question texts for duplicates.
+
+        Same as check_duplicates_batch, but takes the question texts directly
+        so large batches don't need to be built as GeneratedQuestion objects.
+
+        Args:
+            question_texts: List of question texts to check
+            existing_questions: List of existing question data
+
+        Returns:
+            List of DuplicateCheckResult, one per input text
         """
-        logger.info(f"Checking {len(questions)} questions for duplicates")
+        logger.info(f"Checking {len(question_texts)} questions for duplicates")
 
-        results = []
-        for question in questions:
-            try:
-                result = self.check_duplicate(question, existing_questions)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to check duplicate for question: {str(e)}")
-                # Return non-duplicate result to be safe (don't block question)
-                results.append(DuplicateCheckResult(is_duplicate=False))
+        results = self._check_duplicates(
+            question_texts, existing_questions, fail_open=True
+        )
 
         duplicates_found = sum(1 for r in results if r.is_duplicate)
         logger.info(
-            f"Duplicate check complete: {duplicates_found}/{len(questions)} duplicates found"
+            f"Duplicate check complete: {duplicates_found}/{len(question_texts)} "
+            f"duplicates found"
         )
 
         return results
 
+    def _check_duplicates(
+        self,
+        question_texts: List[str],
+        existing_questions: List[Dict[str, Any]],
+        fail_open: bool = False,
+    ) -> List[DuplicateCheckResult]:
+        """Check question texts for exact, then semantic, duplicates.
+
+        Args:
+            question_texts: List of question texts to check
+            existing_questions: List of existing question data
+            fail_open: Report non-duplicates instead of raising when the
+                       semantic check fails
+
+        Returns:
+            List of DuplicateCheckResult, one per input text
+
+        Raises:
+            Exception: If embedding generation fails and fail_open is False
+        """
+        exact_index = self._build_exact_index(existing_questions)
+        question_texts = [text.strip().lower() for text in question_texts]
+
+        # Step 1: Check for exact match (case-insensitive)
+        results: List[DuplicateCheckResult] = []
+        pending: List[int] = []
+        for i, question_text in enumerate(question_texts):
+            existing = exact_index.get(question_text)
+            if existing is not None:
+                logger.info(f"Exact duplicate found for: {question_text[:50]}...")
+                results.append(
+                    DuplicateCheckResult(
+                        is_duplicate=True,
+                        duplicate_type="exact",
+                        similarity_score=1.0,
+                        matched_question=existing,
+                    )
+                )
+            else:
+                results.append(DuplicateCheckResult(is_duplicate=False))
+                pending.append(i)
+
+        # Optionally skip questions that share too few tokens with any existing one
+        if pending and self.lexical_prefilter_threshold is not None:
+            self._update_token_index(existing_questions)
+            pending = [
+                i
+                for i in pending
+                if self._has_lexical_candidate(
+                    frozenset(_TOKEN_PATTERN.findall(question_texts[i]))
+                )
+            ]
+
+        # Step 2: Check remaining questions for semantic similarity using embeddings
+        if pending and existing_questions:
+            try:
+                semantic_results = self._check_semantic_similarity(
+                    [question_texts[i] for i in pending], existing_questions
+                )
+            except Exception as e:
+                if not fail_open:
+                    raise
+                logger.error(f"Failed to check duplicates for questions: {str(e)}")
+                # Keep non-duplicate results to be safe (don't block questions)
+                semantic_results = [results[i] for i in pending]
+
+            for i, result in zip(pending, semantic_results):
+                if result.is_duplicate:
+                    logger.info(
+                        f"Semantic duplicate found with score {result.similarity_score:.3f}"
+                    )
+                results[i] = result
+
+        for question_text, result in zip(question_texts, results):
+            if not result.is_duplicate:
+                logger.debug(f"No duplicate found for: {question_text[:50]}...")
+
+        return results
+
+    @staticmethod
+    def _build_exact_index(
+        existing_questions: List[Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Index existing questions by normalized (stripped, lowercased) text.
+
+        Args:
+            existing_questions: List of existing question data
+
+        Returns:
+            Dictionary mapping normalized text to the first question with that text
+        """
+        index: Dict[str, Dict[str, Any]] = {}
+        for existing in existing_questions:
+            index.setdefault(
+                existing.get("question_text", "").strip().lower(), existing
+            )
+        return index
+
+    def _update_token_index(self, existing_questions: List[Dict[str, Any]]) -> None:
+        """Rebuild the inverted token index if the existing questions changed.
+
+        Args:
+            existing_questions: List of existing question data
+        """
+        key = tuple(q.get("question_text", "") for q in existing_questions)
+        if key != self._token_index_key:
+            self._token_sets = [
+                frozenset(_TOKEN_PATTERN.findall(text.lower())) for text in key
+            ]
+            self._token_index = {}
+            for row, tokens in enumerate(self._token_sets):
+                for token in tokens:
+                    self._token_index.setdefault(token, []).append(row)
+            self._token_index_key = key
+
+    def _has_lexical_candidate(self, tokens: FrozenSet[str]) -> bool:
+        """Check whether any existing question passes the lexical prefilter.
+
+        Uses the index built by _update_token_index.
+
+        Args:
+            tokens: Token set of the normalized question text to check
+
+        Returns:
+            True if some existing question has token-set Jaccard similarity
+            at or above lexical_prefilter_threshold
+        """
+        assert self.lexical_prefilter_threshold is not None
+        candidates = {
+            row for token in tokens for row in self._token_index.get(token, ())
+        }
+        for row in candidates:
+            existing_tokens = self._token_sets[row]
+            jaccard = len(tokens & existing_tokens) / len(tokens | existing_tokens)
+            if jaccard >= self.lexical_prefilter_threshold:
+                return True
+        return False
+
     def _check_semantic_similarity(
         self,
-        question_text: str,
+        question_texts: List[str],
         existing_questions: List[Dict[str, Any]],
-    ) -> DuplicateCheckResult:
+    ) -> List[DuplicateCheckResult]:
         """Check semantic similarity using embeddings.
 
+        New question texts and any existing question texts not yet in the
+        cached matrix are embedded together in as few API calls as possible.
+
         Args:
-            question_text: Question text to check
+            question_texts: Question texts to check
             existing_questions: List of existing question data
 
         Returns:
-            DuplicateCheckResult with semantic similarity details
+            List of DuplicateCheckResult with semantic similarity details,
+            one per question text
 
         Raises:
             Exception: If embedding generation fails
         """
         try:
-            # Generate embedding for new question
-            new_embedding = self._get_embedding(question_text)
-
-            # Compare with existing questions
-            max_similarity = 0.0
-            most_similar_question = None
-
-            for existing in existing_questions:
-                existing_text = existing.get("question_text", "")
-                if not existing_text:
-                    continue
-
-                # Generate embedding for existing question
-                existing_embedding = self._get_embedding(existing_text)
-
-                # Calculate cosine similarity
-                similarity = self._cosine_similarity(new_embedding, existing_embedding)
-
-                if similarity > max_similarity:
-                    max_similarity = similarity
-                    most_similar_question = existing
-
-            # Check if similarity exceeds threshold
-            if max_similarity >= self.similarity_threshold:
-                return DuplicateCheckResult(
-                    is_duplicate=True,
-                    duplicate_type="semantic",
-                    similarity_score=max_similarity,
-                    matched_question=most_similar_question,
+            existing_rows = [
+                q for q in existing_questions if q.get("question_text", "")
+            ]
+            if not existing_rows:
+                return [
+                    DuplicateCheckResult(is_duplicate=False) for _ in question_texts
+                ]
+
+            existing_key = tuple(q["question_text"] for q in existing_rows)
+            rebuild = (
+                self._existing_matrix is None or existing_key != self._existing_key
+            )
+
+            # Generate embeddings for new questions (and existing ones if not cached)
+            texts = list(question_texts)
+            if rebuild:
+                texts.extend(existing_key)
+            # Quantized mode keeps only the int8 matrix of existing questions,
+            # so their float32 embeddings are not cached
+            embeddings = self._get_embeddings(
+                texts,
+                uncached_from=len(question_texts) if self.quantize_embeddings else None,
+            )
+
+            # Matched questions come from this call's rows even when the
+            # cached matrix is reused for the same texts
+            self._existing_rows = existing_rows
+            if rebuild:
+                self._existing_key = existing_key
+                self._set_existing_matrix(
+                    self._normalize_rows(embeddings[len(question_texts) :])
                 )
 
-            return DuplicateCheckResult(is_duplicate=False)
+            # Compare all new questions against all existing ones in one product
+            new_matrix = self._normalize_rows(embeddings[: len(question_texts)])
+            similarities = self._existing_similarities(new_matrix)
+            best_indices = similarities.argmax(axis=1)
+
+            results = []
+            for row, best_index in enumerate(best_indices):
+                # Clamp to [0, 1] range (cosine similarity is [-1, 1], but we expect [0, 1])
+                max_similarity = float(
+                    max(0.0, min(1.0, similarities[row, best_index]))
+                )
+
+                # Check if similarity exceeds threshold
+                if max_similarity >= self.similarity_threshold:
+                    results.append(
+                        DuplicateCheckResult(
+                            is_duplicate=True,
+                            duplicate_type="semantic",
+                            similarity_score=max_similarity,
+                            matched_question=self._existing_rows[int(best_index)],
+                        )
+                    )
+                else:
+                    results.append(DuplicateCheckResult(is_duplicate=False))
+
+            return results
 
         except Exception as e:
             logger.error(f"Semantic similarity check failed: {str(e)}")
             raise
 
+    def _set_existing_matrix(self, matrix: np.ndarray) -> None:
+        """Store the normalized existing question matrix, quantizing if enabled.
+
+        Args:
+            matrix: float32 matrix with unit-length rows
+        """
+        if not self.quantize_embeddings:
+            self._existing_matrix = matrix
+            self._existing_scales = None
+            return
+
+        # Symmetric per-row int8 quantization: row ~= quantized_row * scale
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        self._existing_matrix = np.round(matrix / scales[:, None]).astype(np.int8)
+        self._existing_scales = scales.astype(np.float32)
+
+    def _existing_similarities(self, new_matrix: np.ndarray) -> np.ndarray:
+        """Compute cosine similarities against the cached existing matrix.
+
+        Args:
+            new_matrix: float32 matrix of unit-length new question embeddings
+
+        Returns:
+            Matrix of similarities with one row per new question and one
+            column per existing question
+        """
+        assert self._existing_matrix is not None
+        if self._existing_scales is None:
+            return new_matrix @ self._existing_matrix.T
+
+        # Convert the int8 matrix in row blocks rather than copying it whole
+        similarities = np.empty(
+            (new_matrix.shape[0], self._existing_matrix.shape[0]), dtype=np.float32
+        )
+        for start in range(0, self._existing_matrix.shape[0], _SIMILARITY_BLOCK_ROWS):
+            stop = start + _SIMILARITY_BLOCK_ROWS
+            block = self._existing_matrix[start:stop].astype(np.float32)
+            np.matmul(new_matrix, block.T, out=similarities[:, start:stop])
+        similarities *= self._existing_scales
+        return similarities
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """Scale each row of an embedding matrix to unit length.
+
+        Args:
+            matrix: Embedding matrix with one vector per row
+
+        Returns:
+            float32 matrix with unit-length rows (zero rows are left as zeros)
+        """
+        normalized = np.array(matrix, dtype=np.float32)
+        norms = np.linalg.norm(normalized, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        normalized /= norms
+        return normalized
+
     def _get_embedding(self, text: str) -> np.ndarray:
         """Generate embedding vector for text using OpenAI API.
 
@@ -236,22 +522,122 @@ class QuestionDeduplicator:
             text: Text to generate embedding for
 
         Returns:
-            Numpy array containing embedding vector
+            float32 numpy array containing embedding vector
 
         Raises:
             Exception: If API call fails
         """
-        try:
-            response = self.openai_client.embeddings.create(
-                input=text,
-                model=self.embedding_model,
-            )
-            embedding = response.data[0].embedding
-            return np.array(embedding)
+        return self._get_embeddings([text])[0]
 
-        except Exception as e:
-            logger.error(f"Failed to generate embedding: {str(e)}")
-            raise
+    def _get_embeddings(
+        self, texts: List[str], uncached_from: Optional[int] = None
+    ) -> np.ndarray:
+        """Generate embedding vectors for several texts using batched API calls.
+
+        Embeddings are served from the in-memory cache when available; only
+        texts not yet cached are sent to the API, split into as few requests
+        as the API's per-request limits allow.
+
+        Args:
+            texts: Texts to generate embeddings for
+            uncached_from: If set, embeddings fetched only for texts at or
+                           after this index are not stored in the cache
+
+        Returns:
+            float32 matrix with one embedding row per text, in input order
+
+        Raises:
+            Exception: If API call fails
+        """
+        keys = [self._embedding_cache_key(text) for text in texts]
+        cache_keys = None if uncached_from is None else set(keys[:uncached_from])
+        embeddings: Dict[Tuple[str, str], np.ndarray] = {}
+        missing: Dict[Tuple[str, str], str] = {}
+        for key, text in zip(keys, texts):
+            cached = self._embedding_cache.get(key)
+            if cached is not None:
+                self._embedding_cache.move_to_end(key)
+                embeddings[key] = cached
+            else:
+                missing.setdefault(key, text)
+
+        for batch in self._embedding_batches(list(missing.items())):
+            try:
+                response = self.openai_client.embeddings.create(
+                    input=[text for _, text in batch],
+                    model=self.embedding_model,
+                )
+            except Exception as e:
+                logger.error(f"Failed to generate embeddings: {str(e)}")
+                raise
+
+            # One array per row, so a cached embedding does not keep the
+            # whole response matrix alive
+            fetched = [np.asarray(d.embedding, dtype=np.float32) for d in response.data]
+            for (key, _), embedding in zip(batch, fetched):
+                if cache_keys is None or key in cache_keys:
+                    self._cache_embedding(key, embedding)
+                embeddings[key] = embedding
+
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.vstack([embeddings[key] for key in keys])
+
+    @staticmethod
+    def _embedding_batches(
+        items: List[Tuple[Tuple[str, str], str]],
+    ) -> Iterator[List[Tuple[Tuple[str, str], str]]]:
+        """Split texts to embed into batches within the API request limits.
+
+        Args:
+            items: (cache key, text) pairs to embed
+
+        Yields:
+            Lists of (cache key, text) pairs with at most
+            MAX_EMBEDDING_BATCH_SIZE entries and an estimated token count
+            of at most MAX_EMBEDDING_BATCH_TOKENS
+        """
+        batch: List[Tuple[Tuple[str, str], str]] = []
+        batch_tokens = 0
+        for item in items:
+            # Conservative estimate of ~3 characters per token
+            tokens = len(item[1]) // 3 + 1
+            if batch and (
+                len(batch) >= MAX_EMBEDDING_BATCH_SIZE
+                or batch_tokens + tokens > MAX_EMBEDDING_BATCH_TOKENS
+            ):
+                yield batch
+                batch = []
+                batch_tokens = 0
+            batch.append(item)
+            batch_tokens += tokens
+        if batch:
+            yield batch
+
+    def _embedding_cache_key(self, text: str) -> Tuple[str, str]:
+        """Build the embedding cache key for a text.
+
+        Args:
+            text: Text being embedded
+
+        Returns:
+            Tuple of (embedding model, sha256 hex digest of the text)
+        """
+        return (self.embedding_model, hashlib.sha256(text.encode("utf-8")).hexdigest())
+
+    def _cache_embedding(self, key: Tuple[str, str], embedding: np.ndarray) -> None:
+        """Store an embedding, evicting the least recently used entries.
+
+        Args:
+            key: Cache key from _embedding_cache_key
+            embedding: Embedding vector to store
+        """
+        if self.embedding_cache_size <= 0:
+            return
+        self._embedding_cache[key] = embedding
+        self._embedding_cache.move_to_end(key)
+        while len(self._embedding_cache) > self.embedding_cache_size:
+            self._embedding_cache.popitem(last=False)
 
     def _cosine_similarity(self, vector1: np.ndarray, vector2: np.ndarray) -> float:
         """Calculate cosine similarity between two vectors.
@@ -297,12 +683,14 @@ class QuestionDeduplicator:
         """
         logger.info(f"Filtering duplicates from {len(questions)} questions")
 
+        results = self._check_duplicates(
+            [q.question_text for q in questions], existing_questions
+        )
+
         unique_questions = []
         duplicates = []
 
-        for question in questions:
-            result = self.check_duplicate(question, existing_questions)
-
+        for question, result in zip(questions, results):
             if result.is_duplicate:
                 duplicates.append((question, result))
             else:
@@ -324,4 +712,7 @@ class QuestionDeduplicator:
         return {
             "similarity_threshold": self.similarity_threshold,
             "embedding_model": self.embedding_model,
+            "cached_embeddings": len(self._embedding_cache),
+            "quantize_embeddings": self.quantize_embeddings,
+            "lexical_prefilter_threshold": self.lexical_prefilter_threshold,
         }
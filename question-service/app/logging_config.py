@@ -4,16 +4,24 @@ This module provides structured logging setup with support for console,
 file, and JSON-formatted logging for monitoring systems.
 """
 
-import json
 import logging
 import logging.handlers
 import sys
+from contextvars import ContextVar, Token
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
 
 from .config import settings
 
+# Extra fields added by the active LogContext(s) in the current thread/task
+_log_context: ContextVar[Dict[str, Any]] = ContextVar("log_context")
+
+# File handlers created by setup_logging, keyed by file and rotation settings
+_file_handler_cache: Dict[Tuple[str, int, int, int], logging.Handler] = {}
+
 
 class JSONFormatter(logging.Formatter):
     """Custom formatter that outputs log records as JSON."""
@@ -27,6 +35,17 @@ class JSONFormatter(logging.Formatter):
         Returns:
             JSON-formatted log string
         """
+        return self.format_bytes(record).decode("utf-8")
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format log record as UTF-8 encoded JSON.
+
+        Args:
+            record: Log record to format
+
+        Returns:
+            JSON-formatted log record bytes
+        """
         log_data: Dict[str, Any] = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "level": record.levelname,
@@ -45,7 +64,132 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "extra"):
             log_data["extra"] = record.extra
 
-        return json.dumps(log_data)
+        return orjson.dumps(log_data)
+
+
+class BytesRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that writes pre-encoded bytes.
+
+    Records formatted by JSONFormatter are written as the bytes produced by
+    orjson, skipping the str round-trip and re-encoding done by the stock
+    handler.
+    """
+
+    def _open(self):
+        """Open the log file for buffered binary appends."""
+        return open(self.baseFilename, "ab", buffering=65536)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a formatted record to the file, rotating it if needed.
+
+        Args:
+            record: Log record to write
+        """
+        try:
+            self._write([self._encode(record)])
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def emit_batch(self, records: List[logging.LogRecord]) -> None:
+        """Write several records with a single write and flush.
+
+        Records rejected by this handler's filters are skipped. The batch is
+        only split where the file has to be rotated.
+
+        Args:
+            records: Log records to write, in order
+        """
+        self.acquire()
+        try:
+            chunks = []
+            for record in records:
+                if not self.filter(record):
+                    continue
+                try:
+                    chunks.append(self._encode(record))
+                except RecursionError:
+                    raise
+                except Exception:
+                    self.handleError(record)
+
+            if chunks:
+                try:
+                    self._write(chunks)
+                except RecursionError:
+                    raise
+                except Exception:
+                    self.handleError(records[-1])
+        finally:
+            self.release()
+
+    def _encode(self, record: logging.LogRecord) -> bytes:
+        """Format a record as a UTF-8 encoded line.
+
+        Args:
+            record: Log record to format
+
+        Returns:
+            Formatted record bytes, including the terminator
+        """
+        if isinstance(self.formatter, JSONFormatter):
+            return self.formatter.format_bytes(record) + b"\n"
+        return (self.format(record) + "\n").encode("utf-8")
+
+    def _write(self, chunks: List[bytes]) -> None:
+        """Write encoded records to the file and flush it once.
+
+        Args:
+            chunks: Encoded records, in order
+        """
+        if self.stream is None:
+            self.stream = self._open()
+
+        max_bytes: int = self.maxBytes  # type: ignore[assignment]
+        pending: List[bytes] = []
+        if max_bytes > 0:
+            position = self.stream.tell()
+            for data in chunks:
+                if position and position + len(data) >= max_bytes:
+                    # Write what fits in the current file before rotating
+                    if pending:
+                        self.stream.write(b"".join(pending))  # type: ignore[arg-type]
+                        pending = []
+                    self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+                    position = 0
+                pending.append(data)
+                position += len(data)
+        else:
+            pending = chunks
+
+        self.stream.write(b"".join(pending))  # type: ignore[arg-type]
+        self.flush()
+
+
+class BufferedFileHandler(logging.handlers.MemoryHandler):
+    """Memory handler that writes its buffered records in one batch.
+
+    The stock MemoryHandler passes buffered records to its target one at a
+    time, so a BytesRotatingFileHandler target would still write and flush
+    once per record. This handler hands the whole buffer to
+    BytesRotatingFileHandler.emit_batch instead.
+    """
+
+    def flush(self) -> None:
+        """Write all buffered records to the target and clear the buffer."""
+        self.acquire()
+        try:
+            if isinstance(self.target, BytesRotatingFileHandler):
+                if self.buffer:
+                    self.target.emit_batch(self.buffer)
+                    self.buffer.clear()
+            else:
+                super().flush()
+        finally:
+            self.release()
 
 
 class ColoredFormatter(logging.Formatter):
@@ -61,6 +205,19 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = "\033[0m"
 
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize formatter and precompute colored level names.
+
+        Args:
+            *args: Positional arguments passed to logging.Formatter
+            **kwargs: Keyword arguments passed to logging.Formatter
+        """
+        super().__init__(*args, **kwargs)
+        self._colored_levelnames = {
+            levelname: f"{color}{levelname}{self.RESET}"
+            for levelname, color in self.COLORS.items()
+        }
+
     def format(self, record: logging.LogRecord) -> str:
         """Format log record with colors.
 
@@ -72,16 +229,53 @@ class ColoredFormatter(logging.Formatter):
         """
         # Add color to levelname
         levelname = record.levelname
-        if levelname in self.COLORS:
-            record.levelname = f"{self.COLORS[levelname]}{levelname}{self.RESET}"
+        record.levelname = self._colored_levelnames.get(levelname, levelname)
+
+        try:
+            return super().format(record)
+        finally:
+            # Reset levelname for subsequent formatters
+            record.levelname = levelname
 
-        # Format the message
-        formatted = super().format(record)
 
-        # Reset levelname for subsequent formatters
-        record.levelname = levelname
+class BytesStreamHandler(logging.StreamHandler):
+    """Stream handler that writes JSON records to the binary stream buffer.
 
-        return formatted
+    Records formatted by JSONFormatter are written as the bytes produced by
+    orjson, skipping the decode and re-encode of the text layer. Other
+    formatters, and streams without a UTF-8 binary buffer (such as StringIO),
+    use the standard text write.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a formatted record to the stream.
+
+        Args:
+            record: Log record to write
+        """
+        formatter = self.formatter
+        buffer = getattr(self.stream, "buffer", None)
+        encoding = getattr(self.stream, "encoding", None) or ""
+        if (
+            not isinstance(formatter, JSONFormatter)
+            or buffer is None
+            or encoding.lower().replace("-", "") != "utf8"
+        ):
+            super().emit(record)
+            return
+
+        try:
+            data = formatter.format_bytes(record) + self.terminator.encode("utf-8")
+
+            # Push pending text writes into the buffer first to keep output
+            # ordered, then flush the buffer once with this record
+            self.stream.flush()
+            buffer.write(data)
+            buffer.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
 
 
 def setup_logging(
@@ -91,9 +285,14 @@ def setup_logging(
     enable_file_logging: bool = True,
     max_bytes: int = 10 * 1024 * 1024,  # 10 MB
     backup_count: int = 5,
+    buffer_capacity: int = 512,
+    force: bool = False,
 ) -> None:
     """Configure logging for the question service.
 
+    File handlers are cached per log file and rotation/buffer settings, so
+    calling setup_logging again with the same file reuses the open handler.
+
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file (uses settings if not provided)
@@ -101,6 +300,11 @@ def setup_logging(
         enable_file_logging: Whether to enable file logging
         max_bytes: Maximum size of log file before rotation
         backup_count: Number of backup log files to keep
+        buffer_capacity: Number of file log records to buffer before writing
+                         them in one batch (0 writes every record immediately).
+                         ERROR and above always flush the buffer.
+        force: Whether to close any cached file handler for these settings and
+               open a new one
 
     Raises:
         ValueError: If log_level is invalid
@@ -121,15 +325,18 @@ def setup_logging(
     # Remove existing handlers
     root_logger.handlers.clear()
 
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(numeric_level)
+    # Attach LogContext fields to every record
+    _install_context_record_factory()
 
+    # Console handler
+    console_handler: logging.StreamHandler
     console_formatter: logging.Formatter
     if json_format:
-        # Use JSON formatter for console
+        # Use JSON formatter for console, written as bytes
+        console_handler = BytesStreamHandler(sys.stdout)
         console_formatter = JSONFormatter()
     else:
+        console_handler = logging.StreamHandler(sys.stdout)
         # Use colored formatter for console
         console_format = (
             "%(asctime)s - %(name)s - %(levelname)s - "
@@ -137,6 +344,7 @@ def setup_logging(
         )
         console_formatter = ColoredFormatter(console_format)
 
+    console_handler.setLevel(numeric_level)
     console_handler.setFormatter(console_formatter)
     root_logger.addHandler(console_handler)
 
@@ -146,22 +354,23 @@ def setup_logging(
         if log_file is None:
             log_file = settings.log_file
 
-        # Create logs directory if it doesn't exist
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_key = (log_file, max_bytes, backup_count, buffer_capacity)
+        if force:
+            _close_file_handler(_file_handler_cache.pop(cache_key, None))
 
-        # Rotating file handler
-        file_handler = logging.handlers.RotatingFileHandler(
-            log_file,
-            maxBytes=max_bytes,
-            backupCount=backup_count,
-        )
-        file_handler.setLevel(numeric_level)
+        file_log_handler = _file_handler_cache.get(cache_key)
+        if file_log_handler is not None and not _is_file_handler_open(file_log_handler):
+            # Closed elsewhere (e.g. logging.shutdown); records would be lost
+            _close_file_handler(file_log_handler)
+            file_log_handler = None
+        if file_log_handler is None:
+            file_log_handler = _create_file_handler(
+                log_file, max_bytes, backup_count, buffer_capacity
+            )
+            _file_handler_cache[cache_key] = file_log_handler
 
-        # Always use JSON format for file logs (better for parsing)
-        file_formatter = JSONFormatter()
-        file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
+        file_log_handler.setLevel(numeric_level)
+        root_logger.addHandler(file_log_handler)
 
         root_logger.info(f"File logging enabled: {log_file}")
 
@@ -172,6 +381,79 @@ def setup_logging(
     )
 
 
+def _create_file_handler(
+    log_file: str,
+    max_bytes: int,
+    backup_count: int,
+    buffer_capacity: int,
+) -> logging.Handler:
+    """Create the JSON file handler used by setup_logging.
+
+    Args:
+        log_file: Path to log file
+        max_bytes: Maximum size of log file before rotation
+        backup_count: Number of backup log files to keep
+        buffer_capacity: Number of records to buffer before writing (0 disables)
+
+    Returns:
+        Rotating file handler, wrapped in a BufferedFileHandler when buffering
+    """
+    # Create logs directory if it doesn't exist
+    log_path = Path(log_file)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Rotating file handler
+    file_handler = BytesRotatingFileHandler(
+        log_file,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+    )
+
+    # Always use JSON format for file logs (better for parsing)
+    file_handler.setFormatter(JSONFormatter())
+
+    if buffer_capacity <= 0:
+        return file_handler
+
+    # Batch file writes; flushed on ERROR, when full, and on close/exit
+    return BufferedFileHandler(
+        capacity=buffer_capacity,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+        flushOnClose=True,
+    )
+
+
+def _is_file_handler_open(handler: logging.Handler) -> bool:
+    """Check whether a cached file handler can still write to its file.
+
+    Args:
+        handler: Handler created by _create_file_handler
+
+    Returns:
+        True if the handler (or its buffered target) has an open file stream
+    """
+    target = getattr(handler, "target", handler)
+    stream = getattr(target, "stream", None)
+    return stream is not None and not stream.closed
+
+
+def _close_file_handler(handler: Optional[logging.Handler]) -> None:
+    """Detach and close a cached file handler and its buffered target.
+
+    Args:
+        handler: Handler created by _create_file_handler, or None
+    """
+    if handler is None:
+        return
+
+    logging.getLogger().removeHandler(handler)
+    target = getattr(handler, "target", None)
+    handler.close()
+    if target is not None:
+        target.close()
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a configured logger instance.
 
@@ -184,9 +466,33 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+def _install_context_record_factory() -> None:
+    """Install the log record factory that attaches LogContext fields.
+
+    The factory wraps whatever factory is current and is only installed once;
+    LogContext itself never swaps the global factory.
+    """
+    base_factory = logging.getLogRecordFactory()
+    if getattr(base_factory, "_adds_log_context", False):
+        return
+
+    def record_factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
+        record = base_factory(*args, **kwargs)
+        extra = _log_context.get(None)
+        if extra:
+            record.extra = extra
+        return record
+
+    record_factory._adds_log_context = True  # type: ignore[attr-defined]
+    logging.setLogRecordFactory(record_factory)
+
+
 class LogContext:
     """Context manager for adding extra context to log records.
 
+    Context is stored in a ContextVar, so it is isolated per thread and per
+    asyncio task, and nested contexts merge their fields.
+
     Example:
         with LogContext(request_id="123", user_id="456"):
             logger.info("Processing request")
@@ -199,22 +505,19 @@ class LogContext:
             **kwargs: Extra fields to add to log records
         """
         self.extra = kwargs
-        self.old_factory = logging.getLogRecordFactory()
+        self._token: Optional[Token[Dict[str, Any]]] = None
 
     def __enter__(self) -> "LogContext":
-        """Enter context and modify log record factory."""
-
-        def record_factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
-            record = self.old_factory(*args, **kwargs)
-            record.extra = self.extra
-            return record
-
-        logging.setLogRecordFactory(record_factory)
+        """Enter context and add its fields to the current log context."""
+        _install_context_record_factory()
+        self._token = _log_context.set({**_log_context.get({}), **self.extra})
         return self
 
     def __exit__(self, *args: Any) -> None:
-        """Exit context and restore original log record factory."""
-        logging.setLogRecordFactory(self.old_factory)
+        """Exit context and restore the previous log context."""
+        if self._token is not None:
+            _log_context.reset(self._token)
+            self._token = None
 
 
 # Initialize logging on module import if not already configured
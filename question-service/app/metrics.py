@@ -4,17 +4,123 @@ This module provides functionality to track and report metrics about
 question generation, evaluation, deduplication, and database operations.
 """
 
-import json
 import logging
-from collections import defaultdict
+import sys
+import time
+from collections import Counter, deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import orjson
 
 from .error_classifier import ClassifiedError
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of error records kept per pipeline stage
+MAX_ERROR_RECORDS = 256
+
+# Console templates for print_summary, filled from _flatten_summary keys
+_SUMMARY_TEMPLATE = """
+================================================================================
+QUESTION GENERATION PIPELINE - EXECUTION SUMMARY
+================================================================================
+
+Execution Time:
+  Started:  {execution_start_time}
+  Ended:    {execution_end_time}
+  Duration: {execution_duration_seconds}s
+
+Generation:
+  Requested: {generation_requested}
+  Generated: {generation_generated}
+  Failed:    {generation_failed}
+  Success Rate: {generation_success_rate:.1%}
+  By Provider: {generation_by_provider}
+
+Evaluation:
+  Evaluated: {evaluation_evaluated}
+  Approved:  {evaluation_approved}
+  Rejected:  {evaluation_rejected}
+  Approval Rate: {evaluation_approval_rate:.1%}
+  Avg Score: {evaluation_average_score:.3f}
+
+Deduplication:
+  Checked:    {deduplication_checked}
+  Duplicates: {deduplication_duplicates_found} \
+(Exact: {deduplication_exact_duplicates}, \
+Semantic: {deduplication_semantic_duplicates})
+  Duplicate Rate: {deduplication_duplicate_rate:.1%}
+
+Database:
+  Inserted: {database_inserted}
+  Failed:   {database_failed}
+  Success Rate: {database_success_rate:.1%}
+
+API Usage:
+  Total Calls: {api_total_calls}
+  By Provider: {api_by_provider}
+"""
+
+_ERROR_CLASSIFICATION_TEMPLATE = """
+Error Classification:
+  Total Classified: {error_classification_total_classified_errors}
+  Critical Errors:  {error_classification_critical_errors}
+  By Category: {error_classification_by_category}
+  By Severity: {error_classification_by_severity}
+"""
+
+_OVERALL_TEMPLATE = """
+Overall:
+  Questions Requested: {overall_questions_requested}
+  Questions Inserted:  {overall_questions_final_output}
+  Overall Success:     {overall_overall_success_rate:.1%}
+  Total Errors:        {overall_total_errors}
+================================================================================
+
+"""
+
+
+# Last (perf_counter, ISO timestamp) pair returned by _now_iso
+_timestamp_cache: Tuple[float, str] = (float("-inf"), "")
+
+# How long a cached error timestamp may be reused, in seconds
+_TIMESTAMP_RESOLUTION = 1e-3
+
+
+def _now_iso() -> str:
+    """Get the current UTC time as an ISO 8601 string.
+
+    Bursts of error records within _TIMESTAMP_RESOLUTION share one timestamp
+    instead of each calling datetime.now and isoformat.
+
+    Returns:
+        Current UTC timestamp in ISO 8601 format
+    """
+    global _timestamp_cache
+
+    now = time.perf_counter()
+    if now - _timestamp_cache[0] >= _TIMESTAMP_RESOLUTION:
+        _timestamp_cache = (now, datetime.now(timezone.utc).isoformat())
+    return _timestamp_cache[1]
+
+
+def _flatten_summary(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a metrics summary into "<section>_<key>" template fields.
+
+    Args:
+        summary: Summary returned by MetricsTracker.get_summary
+
+    Returns:
+        Flat dictionary of summary values
+    """
+    return {
+        f"{section}_{key}": value
+        for section, values in summary.items()
+        for key, value in values.items()
+    }
+
 
 class MetricsTracker:
     """Tracks metrics for question generation pipeline operations.
@@ -23,7 +129,56 @@ class MetricsTracker:
     comprehensive reports about pipeline execution.
     """
 
-    def __init__(self):
+    # Fixed attribute set (all assigned in reset) for faster attribute access
+    __slots__ = (
+        "start_time",
+        "end_time",
+        "_start_perf",
+        "_end_perf",
+        # Generation metrics
+        "questions_requested",
+        "questions_generated",
+        "generation_failures",
+        "questions_by_provider",
+        "questions_by_type",
+        "questions_by_difficulty",
+        "generation_errors",
+        # Evaluation metrics
+        "questions_evaluated",
+        "questions_approved",
+        "questions_rejected",
+        "evaluation_failures",
+        "evaluation_scores",
+        "evaluation_score_count",
+        "evaluation_score_sum",
+        "evaluation_score_min",
+        "evaluation_score_max",
+        "evaluation_errors",
+        # Deduplication metrics
+        "questions_checked_for_duplicates",
+        "duplicates_found",
+        "exact_duplicates",
+        "semantic_duplicates",
+        "deduplication_failures",
+        "deduplication_errors",
+        # Database metrics
+        "questions_inserted",
+        "insertion_failures",
+        "insertion_errors",
+        # API metrics
+        "api_calls_by_provider",
+        "total_api_calls",
+        # Error categorization metrics
+        "errors_by_category",
+        "errors_by_severity",
+        "critical_errors",
+        "classified_errors",
+        # Summary cache
+        "_cached_summary",
+        "_dirty",
+    )
+
+    def __init__(self) -> None:
         """Initialize metrics tracker."""
         self.reset()
         logger.debug("MetricsTracker initialized")
@@ -32,56 +187,76 @@ class MetricsTracker:
         """Reset all metrics to initial state."""
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
+        # Monotonic clock readings used for the run duration
+        self._start_perf: Optional[float] = None
+        self._end_perf: Optional[float] = None
 
         # Generation metrics
-        self.questions_requested = 0
-        self.questions_generated = 0
-        self.generation_failures = 0
-        self.questions_by_provider: Dict[str, int] = defaultdict(int)
-        self.questions_by_type: Dict[str, int] = defaultdict(int)
-        self.questions_by_difficulty: Dict[str, int] = defaultdict(int)
-        self.generation_errors: List[Dict[str, Any]] = []
+        self.questions_requested: int = 0
+        self.questions_generated: int = 0
+        self.generation_failures: int = 0
+        self.questions_by_provider: Counter[str] = Counter()
+        self.questions_by_type: Counter[str] = Counter()
+        self.questions_by_difficulty: Counter[str] = Counter()
+        self.generation_errors: Deque[Dict[str, Any]] = deque(maxlen=MAX_ERROR_RECORDS)
 
         # Evaluation metrics
-        self.questions_evaluated = 0
-        self.questions_approved = 0
-        self.questions_rejected = 0
-        self.evaluation_failures = 0
-        self.evaluation_scores: List[float] = []
-        self.evaluation_errors: List[Dict[str, Any]] = []
+        self.questions_evaluated: int = 0
+        self.questions_approved: int = 0
+        self.questions_rejected: int = 0
+        self.evaluation_failures: int = 0
+        # Running score statistics; only the most recent scores are kept
+        self.evaluation_scores: Deque[float] = deque(maxlen=1024)
+        self.evaluation_score_count: int = 0
+        self.evaluation_score_sum: float = 0.0
+        self.evaluation_score_min: float = 0.0
+        self.evaluation_score_max: float = 0.0
+        self.evaluation_errors: Deque[Dict[str, Any]] = deque(maxlen=MAX_ERROR_RECORDS)
 
         # Deduplication metrics
-        self.questions_checked_for_duplicates = 0
-        self.duplicates_found = 0
-        self.exact_duplicates = 0
-        self.semantic_duplicates = 0
-        self.deduplication_errors: List[Dict[str, Any]] = []
+        self.questions_checked_for_duplicates: int = 0
+        self.duplicates_found: int = 0
+        self.exact_duplicates: int = 0
+        self.semantic_duplicates: int = 0
+        self.deduplication_failures: int = 0
+        self.deduplication_errors: Deque[Dict[str, Any]] = deque(
+            maxlen=MAX_ERROR_RECORDS
+        )
 
         # Database metrics
-        self.questions_inserted = 0
-        self.insertion_failures = 0
-        self.insertion_errors: List[Dict[str, Any]] = []
+        self.questions_inserted: int = 0
+        self.insertion_failures: int = 0
+        self.insertion_errors: Deque[Dict[str, Any]] = deque(maxlen=MAX_ERROR_RECORDS)
 
         # API metrics (costs)
-        self.api_calls_by_provider: Dict[str, int] = defaultdict(int)
-        self.total_api_calls = 0
+        self.api_calls_by_provider: Counter[str] = Counter()
+        self.total_api_calls: int = 0
 
         # Error categorization metrics
-        self.errors_by_category: Dict[str, int] = defaultdict(int)
-        self.errors_by_severity: Dict[str, int] = defaultdict(int)
+        self.errors_by_category: Counter[str] = Counter()
+        self.errors_by_severity: Counter[str] = Counter()
         self.critical_errors: List[Dict[str, Any]] = []
         self.classified_errors: List[Dict[str, Any]] = []
 
+        # Summary built by get_summary, reused until the next record_* call
+        self._cached_summary: Optional[Dict[str, Any]] = None
+        self._dirty: bool = True
+
         logger.debug("Metrics reset")
 
     def start_run(self) -> None:
         """Mark the start of a pipeline run."""
         self.start_time = datetime.now(timezone.utc)
+        self._start_perf = time.perf_counter()
+        self._end_perf = None
+        self._dirty = True
         logger.info("Pipeline run started")
 
     def end_run(self) -> None:
         """Mark the end of a pipeline run."""
         self.end_time = datetime.now(timezone.utc)
+        self._end_perf = time.perf_counter()
+        self._dirty = True
         logger.info("Pipeline run completed")
 
     def record_generation_request(self, count: int) -> None:
@@ -90,6 +265,7 @@ class MetricsTracker:
         Args:
             count: Number of questions requested
         """
+        self._dirty = True
         self.questions_requested += count
         logger.debug(f"Recorded generation request: {count} questions")
 
@@ -106,14 +282,45 @@ class MetricsTracker:
             question_type: Type of question
             difficulty: Difficulty level
         """
-        self.questions_generated += 1
-        self.questions_by_provider[provider] += 1
-        self.questions_by_type[question_type] += 1
-        self.questions_by_difficulty[difficulty] += 1
-        self.api_calls_by_provider[provider] += 1
-        self.total_api_calls += 1
+        self.record_generation_successes([provider], [question_type], [difficulty])
+
+    def record_generation_successes(
+        self,
+        providers: List[str],
+        question_types: List[str],
+        difficulties: List[str],
+    ) -> None:
+        """Record a batch of successful question generations.
+
+        Args:
+            providers: LLM provider name for each question
+            question_types: Type of each question
+            difficulties: Difficulty level of each question
 
-        logger.debug(f"Generation success: {provider}/{question_type}/{difficulty}")
+        Raises:
+            ValueError: If the lists have different lengths
+        """
+        count = len(providers)
+        if len(question_types) != count or len(difficulties) != count:
+            raise ValueError(
+                "providers, question_types and difficulties must have the same length"
+            )
+
+        self._dirty = True
+        self.questions_generated += count
+        self.questions_by_provider.update(providers)
+        self.questions_by_type.update(question_types)
+        self.questions_by_difficulty.update(difficulties)
+        self.api_calls_by_provider.update(providers)
+        self.total_api_calls += count
+
+        if count == 1:
+            logger.debug(
+                f"Generation success: {providers[0]}/{question_types[0]}/"
+                f"{difficulties[0]}"
+            )
+        else:
+            logger.debug(f"Generation success: {count} questions")
 
     def record_generation_failure(
         self,
@@ -132,9 +339,10 @@ class MetricsTracker:
             difficulty: Difficulty level (optional)
             classified_error: Classified error with category and severity (optional)
         """
+        self._dirty = True
         self.generation_failures += 1
         error_record = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _now_iso(),
             "provider": provider,
             "question_type": question_type,
             "difficulty": difficulty,
@@ -174,20 +382,64 @@ class MetricsTracker:
             approved: Whether question was approved
             arbiter_model: Arbiter model used
         """
-        self.questions_evaluated += 1
-        self.evaluation_scores.append(score)
+        self.record_evaluation_successes([score], [approved], [arbiter_model])
 
-        if approved:
-            self.questions_approved += 1
-        else:
-            self.questions_rejected += 1
+    def record_evaluation_successes(
+        self,
+        scores: List[float],
+        approved: List[bool],
+        arbiter_models: List[str],
+    ) -> None:
+        """Record a batch of successful question evaluations.
 
-        # Track API call for arbiter
-        provider = arbiter_model.split("/")[0]
-        self.api_calls_by_provider[provider] += 1
-        self.total_api_calls += 1
+        Args:
+            scores: Evaluation score for each question
+            approved: Whether each question was approved
+            arbiter_models: Arbiter model used for each question
 
-        logger.debug(f"Evaluation success: score={score:.3f}, approved={approved}")
+        Raises:
+            ValueError: If the lists have different lengths
+        """
+        count = len(scores)
+        if len(approved) != count or len(arbiter_models) != count:
+            raise ValueError(
+                "scores, approved and arbiter_models must have the same length"
+            )
+        if count == 0:
+            return
+
+        self._dirty = True
+        self.questions_evaluated += count
+        self.evaluation_scores.extend(scores)
+        batch_min = min(scores)
+        batch_max = max(scores)
+        if self.evaluation_score_count == 0:
+            self.evaluation_score_min = batch_min
+            self.evaluation_score_max = batch_max
+        else:
+            self.evaluation_score_min = min(self.evaluation_score_min, batch_min)
+            self.evaluation_score_max = max(self.evaluation_score_max, batch_max)
+        self.evaluation_score_count += count
+        self.evaluation_score_sum += sum(scores)
+
+        approved_count = sum(approved)
+        self.questions_approved += approved_count
+        self.questions_rejected += count - approved_count
+
+        # Track API calls for arbiter
+        self.api_calls_by_provider.update(
+            model.split("/")[0] for model in arbiter_models
+        )
+        self.total_api_calls += count
+
+        if count == 1:
+            logger.debug(
+                f"Evaluation success: score={scores[0]:.3f}, approved={approved[0]}"
+            )
+        else:
+            logger.debug(
+                f"Evaluation success: {count} questions, {approved_count} approved"
+            )
 
     def record_evaluation_failure(
         self,
@@ -200,10 +452,11 @@ class MetricsTracker:
             error: Error message
             arbiter_model: Arbiter model used (optional)
         """
+        self._dirty = True
         self.evaluation_failures += 1
         self.evaluation_errors.append(
             {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": _now_iso(),
                 "arbiter_model": arbiter_model,
                 "error": error,
             }
@@ -221,6 +474,7 @@ class MetricsTracker:
             is_duplicate: Whether question is a duplicate
             duplicate_type: Type of duplicate ("exact" or "semantic")
         """
+        self._dirty = True
         self.questions_checked_for_duplicates += 1
 
         if is_duplicate:
@@ -241,9 +495,11 @@ class MetricsTracker:
         Args:
             error: Error message
         """
+        self._dirty = True
+        self.deduplication_failures += 1
         self.deduplication_errors.append(
             {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": _now_iso(),
                 "error": error,
             }
         )
@@ -255,6 +511,7 @@ class MetricsTracker:
         Args:
             count: Number of questions inserted
         """
+        self._dirty = True
         self.questions_inserted += count
         logger.debug(f"Insertion success: {count} questions")
 
@@ -265,10 +522,11 @@ class MetricsTracker:
             error: Error message
             count: Number of questions that failed to insert
         """
+        self._dirty = True
         self.insertion_failures += count
         self.insertion_errors.append(
             {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": _now_iso(),
                 "count": count,
                 "error": error,
             }
@@ -278,9 +536,16 @@ class MetricsTracker:
     def get_duration_seconds(self) -> float:
         """Get duration of pipeline run in seconds.
 
+        Uses the monotonic clock readings taken by start_run/end_run, so the
+        duration is unaffected by wall-clock adjustments. Falls back to the
+        start/end timestamps when those were set directly.
+
         Returns:
             Duration in seconds, or 0 if run not completed
         """
+        if self._start_perf is not None and self._end_perf is not None:
+            return self._end_perf - self._start_perf
+
         if not self.start_time or not self.end_time:
             return 0.0
 
@@ -289,9 +554,16 @@ class MetricsTracker:
     def get_summary(self) -> Dict[str, Any]:
         """Generate comprehensive metrics summary.
 
+        The summary is cached and only rebuilt after metrics have been recorded
+        through the record_*, start_run, end_run or reset methods. Callers
+        should treat the returned dictionary as read-only.
+
         Returns:
             Dictionary with all metrics and statistics
         """
+        if not self._dirty and self._cached_summary is not None:
+            return self._cached_summary
+
         duration = self.get_duration_seconds()
 
         summary = {
@@ -312,7 +584,7 @@ class MetricsTracker:
                 "by_provider": dict(self.questions_by_provider),
                 "by_type": dict(self.questions_by_type),
                 "by_difficulty": dict(self.questions_by_difficulty),
-                "errors": self.generation_errors[-10:],  # Last 10 errors
+                "errors": list(self.generation_errors)[-10:],  # Last 10 errors
             },
             "evaluation": {
                 "evaluated": self.questions_evaluated,
@@ -325,17 +597,13 @@ class MetricsTracker:
                     else 0.0
                 ),
                 "average_score": (
-                    sum(self.evaluation_scores) / len(self.evaluation_scores)
-                    if self.evaluation_scores
+                    self.evaluation_score_sum / self.evaluation_score_count
+                    if self.evaluation_score_count > 0
                     else 0.0
                 ),
-                "min_score": min(self.evaluation_scores)
-                if self.evaluation_scores
-                else 0.0,
-                "max_score": max(self.evaluation_scores)
-                if self.evaluation_scores
-                else 0.0,
-                "errors": self.evaluation_errors[-10:],  # Last 10 errors
+                "min_score": self.evaluation_score_min,
+                "max_score": self.evaluation_score_max,
+                "errors": list(self.evaluation_errors)[-10:],  # Last 10 errors
             },
             "deduplication": {
                 "checked": self.questions_checked_for_duplicates,
@@ -347,7 +615,8 @@ class MetricsTracker:
                     if self.questions_checked_for_duplicates > 0
                     else 0.0
                 ),
-                "errors": self.deduplication_errors[-10:],  # Last 10 errors
+                "failed": self.deduplication_failures,
+                "errors": list(self.deduplication_errors)[-10:],  # Last 10 errors
             },
             "database": {
                 "inserted": self.questions_inserted,
@@ -358,7 +627,7 @@ class MetricsTracker:
                     if (self.questions_inserted + self.insertion_failures) > 0
                     else 0.0
                 ),
-                "errors": self.insertion_errors[-10:],  # Last 10 errors
+                "errors": list(self.insertion_errors)[-10:],  # Last 10 errors
             },
             "api": {
                 "total_calls": self.total_api_calls,
@@ -387,83 +656,22 @@ class MetricsTracker:
             },
         }
 
+        self._cached_summary = summary
+        self._dirty = False
         return summary
 
     def print_summary(self) -> None:
         """Print formatted metrics summary to console."""
-        summary = self.get_summary()
-
-        print("\n" + "=" * 80)
-        print("QUESTION GENERATION PIPELINE - EXECUTION SUMMARY")
-        print("=" * 80)
-
-        # Execution info
-        exec_info = summary["execution"]
-        print("\nExecution Time:")
-        print(f"  Started:  {exec_info['start_time']}")
-        print(f"  Ended:    {exec_info['end_time']}")
-        print(f"  Duration: {exec_info['duration_seconds']}s")
-
-        # Generation stats
-        gen = summary["generation"]
-        print("\nGeneration:")
-        print(f"  Requested: {gen['requested']}")
-        print(f"  Generated: {gen['generated']}")
-        print(f"  Failed:    {gen['failed']}")
-        print(f"  Success Rate: {gen['success_rate']:.1%}")
-        print(f"  By Provider: {gen['by_provider']}")
-
-        # Evaluation stats
-        eval_stats = summary["evaluation"]
-        print("\nEvaluation:")
-        print(f"  Evaluated: {eval_stats['evaluated']}")
-        print(f"  Approved:  {eval_stats['approved']}")
-        print(f"  Rejected:  {eval_stats['rejected']}")
-        print(f"  Approval Rate: {eval_stats['approval_rate']:.1%}")
-        print(f"  Avg Score: {eval_stats['average_score']:.3f}")
-
-        # Deduplication stats
-        dedup = summary["deduplication"]
-        print("\nDeduplication:")
-        print(f"  Checked:    {dedup['checked']}")
-        print(
-            f"  Duplicates: {dedup['duplicates_found']} "
-            f"(Exact: {dedup['exact_duplicates']}, "
-            f"Semantic: {dedup['semantic_duplicates']})"
-        )
-        print(f"  Duplicate Rate: {dedup['duplicate_rate']:.1%}")
-
-        # Database stats
-        db = summary["database"]
-        print("\nDatabase:")
-        print(f"  Inserted: {db['inserted']}")
-        print(f"  Failed:   {db['failed']}")
-        print(f"  Success Rate: {db['success_rate']:.1%}")
-
-        # API usage
-        api = summary["api"]
-        print("\nAPI Usage:")
-        print(f"  Total Calls: {api['total_calls']}")
-        print(f"  By Provider: {api['by_provider']}")
-
-        # Error classification
-        error_class = summary["error_classification"]
-        if error_class["total_classified_errors"] > 0:
-            print("\nError Classification:")
-            print(f"  Total Classified: {error_class['total_classified_errors']}")
-            print(f"  Critical Errors:  {error_class['critical_errors']}")
-            print(f"  By Category: {error_class['by_category']}")
-            print(f"  By Severity: {error_class['by_severity']}")
-
-        # Overall
-        overall = summary["overall"]
-        print("\nOverall:")
-        print(f"  Questions Requested: {overall['questions_requested']}")
-        print(f"  Questions Inserted:  {overall['questions_final_output']}")
-        print(f"  Overall Success:     {overall['overall_success_rate']:.1%}")
-        print(f"  Total Errors:        {overall['total_errors']}")
-
-        print("=" * 80 + "\n")
+        flat = _flatten_summary(self.get_summary())
+
+        output = _SUMMARY_TEMPLATE.format(**flat)
+        if flat["error_classification_total_classified_errors"] > 0:
+            output += _ERROR_CLASSIFICATION_TEMPLATE.format(**flat)
+        output += _OVERALL_TEMPLATE.format(**flat)
+
+        # Single write so the console summary is flushed at once
+        sys.stdout.write(output)
+        sys.stdout.flush()
 
     def save_summary(self, output_path: str) -> None:
         """Save metrics summary to JSON file.
@@ -480,8 +688,9 @@ class MetricsTracker:
             output_file = Path(output_path)
             output_file.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(output_file, "w") as f:
-                json.dump(summary, f, indent=2)
+            output_file.write_bytes(
+                orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC)
+            )
 
             logger.info(f"Metrics summary saved to: {output_path}")
 
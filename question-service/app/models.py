@@ -146,5 +146,8 @@ class GenerationBatch(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
     def __len__(self) -> int:
-        """Get number of questions in batch."""
+        """Get number of questions in batch.
+
+        This can be lower than batch_size when some generations failed.
+        """
         return len(self.questions)
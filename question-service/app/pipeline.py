@@ -9,7 +9,6 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 from .config import settings
-from .generator import QuestionGenerator
 from .models import (
     DifficultyLevel,
     GenerationBatch,
@@ -47,6 +46,9 @@ class QuestionGenerationPipeline:
         self.google_key = google_api_key or settings.google_api_key
         self.xai_key = xai_api_key or settings.xai_api_key
 
+        # Imported here so the provider SDKs only load when a pipeline is built
+        from .generator import QuestionGenerator
+
         # Initialize generator
         self.generator = QuestionGenerator(
             openai_api_key=self.openai_key,
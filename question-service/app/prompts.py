@@ -4,7 +4,8 @@ This module contains the prompts used to generate different types of
 IQ test questions from various LLM providers.
 """
 
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 from .models import DifficultyLevel, QuestionType
 
@@ -259,29 +260,14 @@ JSON_RESPONSE_FORMAT = {
 }
 
 
-def build_generation_prompt(
-    question_type: QuestionType, difficulty: DifficultyLevel, count: int = 1
-) -> str:
-    """Build a complete generation prompt for a specific question type and difficulty.
-
-    Args:
-        question_type: Type of question to generate
-        difficulty: Difficulty level
-        count: Number of questions to generate (default: 1)
-
-    Returns:
-        Complete prompt string for the LLM
-    """
-    type_prompt = QUESTION_TYPE_PROMPTS[question_type]
-    diff_instructions = DIFFICULTY_INSTRUCTIONS[difficulty]
-
-    prompt = f"""{SYSTEM_PROMPT}
+# Per-request part of the generation prompt; the system prompt is prepended once
+_GENERATION_PROMPT_TEMPLATE = """{system_prompt}
 
 {type_prompt}
 
 {diff_instructions}
 
-Generate {count} unique, high-quality {"question" if count == 1 else "questions"} of type '{question_type.value}' at '{difficulty.value}' difficulty.
+Generate {count} unique, high-quality {noun} of type '{type_value}' at '{difficulty_value}' difficulty.
 
 IMPORTANT: Respond with valid JSON only. Do not include any text outside the JSON structure.
 
@@ -291,10 +277,53 @@ For each question, provide:
 3. answer_options: An array of 4-6 options (must include correct_answer)
 4. explanation: A clear explanation of why the answer is correct
 
-{"If generating multiple questions, return an array of question objects." if count > 1 else "Return a single question object."}
-"""
+{closing}"""
+
 
-    return prompt.strip()
+@lru_cache(maxsize=256)
+def build_generation_prompt(
+    question_type: QuestionType, difficulty: DifficultyLevel, count: int = 1
+) -> str:
+    """Build a complete generation prompt for a specific question type and difficulty.
+
+    Prompts are deterministic, so they are cached per (type, difficulty, count).
+
+    Args:
+        question_type: Type of question to generate
+        difficulty: Difficulty level
+        count: Number of questions to generate (default: 1)
+
+    Returns:
+        Complete prompt string for the LLM
+    """
+    return _GENERATION_PROMPT_TEMPLATE.format(
+        system_prompt=SYSTEM_PROMPT,
+        type_prompt=QUESTION_TYPE_PROMPTS[question_type],
+        diff_instructions=DIFFICULTY_INSTRUCTIONS[difficulty],
+        count=count,
+        noun="question" if count == 1 else "questions",
+        type_value=question_type.value,
+        difficulty_value=difficulty.value,
+        closing=(
+            "If generating multiple questions, return an array of question objects."
+            if count > 1
+            else "Return a single question object."
+        ),
+    ).strip()
+
+
+def build_generation_prompts_bulk(
+    specs: List[Tuple[QuestionType, DifficultyLevel, int]],
+) -> Dict[Tuple[QuestionType, DifficultyLevel, int], str]:
+    """Build generation prompts for several question specifications at once.
+
+    Args:
+        specs: (question_type, difficulty, count) tuples to build prompts for
+
+    Returns:
+        Dictionary mapping each spec to its prompt string
+    """
+    return {spec: build_generation_prompt(*spec) for spec in specs}
 
 
 def build_arbiter_prompt(
@@ -1,7 +1,19 @@
 """Pytest configuration and shared fixtures for question service tests."""
 
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict
+
 import pytest
 
+from app.models import (
+    DifficultyLevel,
+    EvaluationScore,
+    GeneratedQuestion,
+    QuestionType,
+)
+
 
 @pytest.fixture
 def mock_openai_api_key() -> str:
@@ -43,3 +55,80 @@ def mock_json_response() -> dict:
         "correct_answer": "32",
         "answer_options": ["24", "30", "32", "64"],
     }
+
+
+@pytest.fixture(scope="session")
+def trusted_question() -> Callable[..., GeneratedQuestion]:
+    """Fixture providing a factory for unvalidated GeneratedQuestion instances.
+
+    The factory uses model_construct, so it is only suitable for trusted,
+    static test data. Tests of validation rules should call the
+    GeneratedQuestion constructor directly.
+    """
+    defaults: Dict[str, Any] = {
+        "question_type": QuestionType.MATHEMATICAL,
+        "difficulty_level": DifficultyLevel.EASY,
+        "source_llm": "openai",
+        "source_model": "gpt-4",
+    }
+
+    def build(**kwargs: Any) -> GeneratedQuestion:
+        return GeneratedQuestion.model_construct(**{**defaults, **kwargs})
+
+    return build
+
+
+@pytest.fixture(scope="module")
+def sample_math_question() -> GeneratedQuestion:
+    """Fixture providing a validated question shared across a test module.
+
+    Tests must not mutate it; use model_copy(update=...) for variants.
+    """
+    return GeneratedQuestion(
+        question_text="What is 2 + 2?",
+        question_type=QuestionType.MATHEMATICAL,
+        difficulty_level=DifficultyLevel.EASY,
+        correct_answer="4",
+        answer_options=["2", "3", "4", "5"],
+        explanation="Basic addition",
+        metadata={"tag": "test"},
+        source_llm="openai",
+        source_model="gpt-4",
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_score() -> EvaluationScore:
+    """Fixture providing a validated evaluation score shared across a module."""
+    return EvaluationScore(
+        clarity_score=0.9,
+        difficulty_score=0.8,
+        validity_score=0.85,
+        formatting_score=0.95,
+        creativity_score=0.7,
+        overall_score=0.84,
+        feedback="Good question overall",
+    )
+
+
+@pytest.fixture(scope="session")
+def assert_import_isolated() -> Callable[[str, str], None]:
+    """Fixture providing a check that importing a module skips another one.
+
+    The import runs in a fresh interpreter so modules already loaded by the
+    test session do not affect the result.
+    """
+
+    def check(module: str, unloaded_module: str) -> None:
+        code = (
+            f"import sys, {module}; "
+            f"assert {unloaded_module!r} not in sys.modules, "
+            f"'{module} imported {unloaded_module}'"
+        )
+        subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).resolve().parents[1],
+            check=True,
+        )
+
+    return check
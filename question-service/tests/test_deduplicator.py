@@ -4,7 +4,12 @@ import numpy as np
 import pytest
 from unittest.mock import Mock, patch
 
-from app.deduplicator import DuplicateCheckResult, QuestionDeduplicator
+from app.deduplicator import (
+    MAX_EMBEDDING_BATCH_SIZE,
+    MAX_EMBEDDING_BATCH_TOKENS,
+    DuplicateCheckResult,
+    QuestionDeduplicator,
+)
 from app.models import DifficultyLevel, GeneratedQuestion, QuestionType
 
 
@@ -24,6 +29,14 @@ def sample_question():
     )
 
 
+@pytest.fixture(scope="session")
+def random_embeddings():
+    """Create a shared, read-only matrix of random float32 embeddings."""
+    embeddings = np.random.default_rng(42).random((64, 1536), dtype=np.float32)
+    embeddings.flags.writeable = False
+    return embeddings
+
+
 @pytest.fixture
 def sample_existing_questions():
     """Create sample existing questions for testing."""
@@ -46,6 +59,20 @@ def sample_existing_questions():
     ]
 
 
+@pytest.fixture
+def mock_embeddings_client():
+    """Patch the OpenAI client so embeddings.create answers any number of inputs.
+
+    Each text is embedded as [len(text), 1.0], so tests can tell inputs apart.
+    """
+    with patch("app.deduplicator.OpenAI") as mock_openai:
+        client = mock_openai.return_value
+        client.embeddings.create.side_effect = lambda input, model: Mock(
+            data=[Mock(embedding=[float(len(text)), 1.0]) for text in input]
+        )
+        yield client
+
+
 class TestDuplicateCheckResult:
     """Tests for DuplicateCheckResult class."""
 
@@ -105,6 +132,18 @@ class TestQuestionDeduplicator:
         assert deduplicator.similarity_threshold == 0.85
         assert deduplicator.embedding_model == "text-embedding-3-small"
 
+    @patch("app.deduplicator.OpenAI")
+    def test_openai_client_created_lazily(self, mock_openai):
+        """Test the OpenAI client is only created when first needed."""
+        deduplicator = QuestionDeduplicator(openai_api_key="test-key")
+
+        mock_openai.assert_not_called()
+
+        client = deduplicator.openai_client
+
+        mock_openai.assert_called_once_with(api_key="test-key")
+        assert deduplicator.openai_client is client
+
     @patch("app.deduplicator.OpenAI")
     def test_initialization_invalid_threshold_too_high(self, mock_openai):
         """Test initialization with threshold > 1.0."""
@@ -123,6 +162,15 @@ class TestQuestionDeduplicator:
                 similarity_threshold=-0.1,
             )
 
+    @patch("app.deduplicator.OpenAI")
+    def test_initialization_invalid_lexical_prefilter_threshold(self, mock_openai):
+        """Test initialization with lexical prefilter threshold > 1.0."""
+        with pytest.raises(ValueError, match="lexical_prefilter_threshold"):
+            QuestionDeduplicator(
+                openai_api_key="test-key",
+                lexical_prefilter_threshold=1.5,
+            )
+
     @patch("app.deduplicator.OpenAI")
     def test_initialization_custom_model(self, mock_openai):
         """Test initialization with custom embedding model."""
@@ -167,25 +215,28 @@ class TestQuestionDeduplicator:
         assert result.is_duplicate is True
         assert result.duplicate_type == "exact"
 
+    @patch("app.deduplicator.OpenAI")
+    def test_build_exact_index_keeps_first_match(self, mock_openai):
+        """Test exact index normalizes text and keeps the first matching question."""
+        existing = [
+            {"id": 1, "question_text": "  What is 2 + 2?"},
+            {"id": 2, "question_text": "WHAT IS 2 + 2?"},
+        ]
+
+        index = QuestionDeduplicator._build_exact_index(existing)
+
+        assert list(index) == ["what is 2 + 2?"]
+        assert index["what is 2 + 2?"]["id"] == 1
+
     @patch("app.deduplicator.OpenAI")
     def test_check_duplicate_no_match(
-        self, mock_openai, sample_question, sample_existing_questions
+        self, mock_openai, sample_question, sample_existing_questions, random_embeddings
     ):
         """Test when no duplicate found."""
         deduplicator = QuestionDeduplicator(openai_api_key="test-key")
 
-        # Mock embedding generation to return orthogonal vectors (low similarity)
-        # Use different random vectors with specific seeds for reproducibility
-        np.random.seed(42)
-        vec_new = np.random.rand(1536)
-        np.random.seed(123)
-        vec1 = np.random.rand(1536)
-        np.random.seed(456)
-        vec2 = np.random.rand(1536)
-        np.random.seed(789)
-        vec3 = np.random.rand(1536)
-
-        deduplicator._get_embedding = Mock(side_effect=[vec_new, vec1, vec2, vec3])
+        # Mock embedding generation to return unrelated random vectors (low similarity)
+        deduplicator._get_embeddings = Mock(return_value=random_embeddings[:4])
 
         result = deduplicator.check_duplicate(
             sample_question, sample_existing_questions
@@ -195,7 +246,7 @@ class TestQuestionDeduplicator:
 
     @patch("app.deduplicator.OpenAI")
     def test_check_duplicate_semantic_match(
-        self, mock_openai, sample_question, sample_existing_questions
+        self, mock_openai, sample_question, sample_existing_questions, random_embeddings
     ):
         """Test semantic duplicate detection."""
         deduplicator = QuestionDeduplicator(
@@ -204,16 +255,18 @@ class TestQuestionDeduplicator:
         )
 
         # Mock embedding generation to return similar vectors
-        base_vector = np.random.rand(1536)
-        similar_vector = base_vector + np.random.rand(1536) * 0.1  # Very similar
-
-        deduplicator._get_embedding = Mock(
-            side_effect=[
-                base_vector,  # New question
-                np.random.rand(1536),  # Existing 1 (different)
-                np.random.rand(1536),  # Existing 2 (different)
-                similar_vector,  # Existing 3 (similar)
-            ]
+        base_vector = random_embeddings[0]
+        similar_vector = base_vector + random_embeddings[1] * 0.1  # Very similar
+
+        deduplicator._get_embeddings = Mock(
+            return_value=np.vstack(
+                [
+                    base_vector,  # New question
+                    random_embeddings[2],  # Existing 1 (different)
+                    random_embeddings[3],  # Existing 2 (different)
+                    similar_vector,  # Existing 3 (similar)
+                ]
+            )
         )
 
         result = deduplicator.check_duplicate(
@@ -224,6 +277,180 @@ class TestQuestionDeduplicator:
         assert result.duplicate_type == "semantic"
         assert result.similarity_score >= 0.85
 
+    @patch("app.deduplicator.OpenAI")
+    def test_check_duplicate_reuses_existing_embeddings(
+        self, mock_openai, sample_question, sample_existing_questions, random_embeddings
+    ):
+        """Test existing question embeddings are computed once per existing list."""
+        deduplicator = QuestionDeduplicator(openai_api_key="test-key")
+
+        vectors = random_embeddings[:4]
+        deduplicator._get_embeddings = Mock(side_effect=[vectors, vectors[:1]])
+
+        deduplicator.check_duplicate(sample_question, sample_existing_questions)
+        deduplicator.check_duplicate(sample_question, sample_existing_questions)
+
+        # 1 new + 3 existing on the first call, only 1 new on the second
+        first_texts = deduplicator._get_embeddings.call_args_list[0].args[0]
+        second_texts = deduplicator._get_embeddings.call_args_list[1].args[0]
+        assert len(first_texts) == 4
+        assert second_texts == ["what is 2 + 2?"]
+
+    @patch("app.deduplicator.OpenAI")
+    def test_check_duplicate_matches_current_existing_rows(
+        self, mock_openai, sample_question, random_embeddings
+    ):
+        """Test a reused matrix still reports the caller's matched question."""
+        deduplicator = QuestionDeduplicator(openai_api_key="test-key")
+        vector = random_embeddings[0]
+        deduplicator._get_embeddings = Mock(
+            side_effect=[np.vstack([vector, vector]), vector[None, :]]
+        )
+
+        deduplicator.check_duplicate(
+            sample_question, [{"id": 1, "question_text": "What is two plus two?"}]
+        )
+        result = deduplicator.check_duplicate(
+            sample_question, [{"id": 99, "question_text": "What is two plus two?"}]
+        )
+
+        assert result.is_duplicate is True
+        assert result.matched_question["id"] == 99
+
+    @patch("app.deduplicator.OpenAI")
+    def test_check_duplicate_semantic_match_quantized(
+        self, mock_openai, sample_question, sample_existing_questions, random_embeddings
+    ):
+        """Test semantic matching with int8-quantized existing embeddings."""
+        deduplicator = QuestionDeduplicator(
+            openai_api_key="test-key",
+            similarity_threshold=0.85,
+            quantize_embeddings=True,
+        )
+
+        base_vector = random_embeddings[0]
+        deduplicator._get_embeddings = Mock(
+            return_value=np.vstack(
+                [
+                    base_vector,  # New question
+                    random_embeddings[2],  # Existing 1 (different)
+                    random_embeddings[3],  # Existing 2 (different)
+                    base_vector + random_embeddings[1] * 0.1,  # Existing 3 (similar)
+                ]
+            )
+        )
+
+        result = deduplicator.check_duplicate(
+            sample_question, sample_existing_questions
+        )
+
+        assert deduplicator._existing_matrix.dtype == np.int8
+        assert result.is_duplicate is True
+        assert result.matched_question["id"] == 3
+        assert result.similarity_score >= 0.85
+
+    @patch("app.deduplicator.OpenAI")
+    def test_quantized_similarities_match_float32(self, mock_openai):
+        """Test blockwise int8 similarities agree with the float32 product."""
+        rng = np.random.default_rng(0)
+        existing = QuestionDeduplicator._normalize_rows(rng.random((300, 64)))
+        new = QuestionDeduplicator._normalize_rows(rng.random((3, 64)))
+
+        deduplicator = QuestionDeduplicator(
+            openai_api_key="test-key", quantize_embeddings=True
+        )
+        deduplicator._set_existing_matrix(existing)
+
+        similarities = deduplicator._existing_similarities(new)
+
+        assert similarities.shape == (3, 300)
+        assert np.allclose(similarities, new @ existing.T, atol=0.02)
+
+    def test_quantized_mode_does_not_cache_existing_embeddings(
+        self, mock_embeddings_client, sample_question, sample_existing_questions
+    ):
+        """Test only new question embeddings are cached when quantizing."""
+        deduplicator = QuestionDeduplicator(
+            openai_api_key="test-key", quantize_embeddings=True
+        )
+
+        deduplicator.check_duplicate(sample_question, sample_existing_questions)
+
+        assert list(deduplicator._embedding_cache) == [
+            deduplicator._embedding_cache_key("what is 2 + 2?")
+        ]
+
+    @patch("app.deduplicator.OpenAI")
+    def test_lexical_prefilter_skips_unrelated_questions(
+        self, mock_openai, sample_existing_questions
+    ):
+        """Test questions with little lexical overlap skip the embedding request."""
+        question = GeneratedQuestion(
+            question_text="Which animal is largest?",
+            question_type=QuestionType.VERBAL_REASONING,
+            difficulty_level=DifficultyLevel.EASY,
+            correct_answer="Whale",
+            answer_options=["Whale", "Ant", "Cat", "Dog"],
+            explanation="The blue whale is the largest animal",
+            source_llm="openai",
+            source_model="gpt-4",
+        )
+        deduplicator = QuestionDeduplicator(
+            openai_api_key="test-key",
+            lexical_prefilter_threshold=0.2,
+        )
+        deduplicator._get_embeddings = Mock()
+
+        result = deduplicator.check_duplicate(question, sample_existing_questions)
+
+        assert result.is_duplicate is False
+        deduplicator._get_embeddings.assert_not_called()
+
+    @patch("app.deduplicator.OpenAI")
+    def test_lexical_prefilter_keeps_overlapping_questions(
+        self, mock_openai, sample_existing_questions, random_embeddings
+    ):
+        """Test questions sharing enough tokens still get a semantic check."""
+        question = GeneratedQuestion(
+            question_text="What is the capital city of France?",
+            question_type=QuestionType.VERBAL_REASONING,
+            difficulty_level=DifficultyLevel.EASY,
+            correct_answer="Paris",
+            answer_options=["London", "Paris", "Berlin", "Rome"],
+            explanation="Paris is the capital of France",
+            source_llm="openai",
+            source_model="gpt-4",
+        )
+        deduplicator = QuestionDeduplicator(
+            openai_api_key="test-key",
+            lexical_prefilter_threshold=0.2,
+        )
+        deduplicator._get_embeddings = Mock(return_value=random_embeddings[:4])
+
+        deduplicator.check_duplicate(question, sample_existing_questions)
+
+        deduplicator._get_embeddings.assert_called_once()
+
+    @patch("app.deduplicator.OpenAI")
+    def test_lexical_prefilter_indexes_once_per_batch(
+        self, mock_openai, sample_existing_questions
+    ):
+        """Test the token index is validated once per batch, not per question."""
+        deduplicator = QuestionDeduplicator(
+            openai_api_key="test-key",
+            lexical_prefilter_threshold=0.9,
+        )
+        deduplicator._update_token_index = Mock(wraps=deduplicator._update_token_index)
+
+        deduplicator.check_duplicates_batch_texts(
+            ["Name a primary color", "Name a planet", "Name an ocean"],
+            sample_existing_questions,
+        )
+
+        deduplicator._update_token_index.assert_called_once_with(
+            sample_existing_questions
+        )
+
     @patch("app.deduplicator.OpenAI")
     def test_check_duplicate_empty_existing_list(self, mock_openai, sample_question):
         """Test check with empty existing questions list."""
@@ -234,7 +461,9 @@ class TestQuestionDeduplicator:
         assert result.is_duplicate is False
 
     @patch("app.deduplicator.OpenAI")
-    def test_check_duplicates_batch(self, mock_openai, sample_existing_questions):
+    def test_check_duplicates_batch(
+        self, mock_openai, sample_existing_questions, random_embeddings
+    ):
         """Test batch duplicate checking."""
         questions = [
             GeneratedQuestion(
@@ -272,14 +501,8 @@ class TestQuestionDeduplicator:
         deduplicator = QuestionDeduplicator(openai_api_key="test-key")
 
         # Mock embeddings to ensure no semantic matches for non-exact duplicates
-        # Generate different random vectors for each question
-        def get_mock_embedding(seed):
-            np.random.seed(seed)
-            return np.random.rand(1536)
-
-        deduplicator._get_embedding = Mock(
-            side_effect=[get_mock_embedding(i) for i in range(100, 120)]
-        )
+        # 2 non-exact new questions + 3 existing questions in one request
+        deduplicator._get_embeddings = Mock(return_value=random_embeddings[4:9])
 
         results = deduplicator.check_duplicates_batch(
             questions, sample_existing_questions
@@ -291,6 +514,34 @@ class TestQuestionDeduplicator:
         assert results[1].duplicate_type == "exact"
         assert results[2].is_duplicate is False  # New question
 
+        # All embeddings come from a single batched request
+        deduplicator._get_embeddings.assert_called_once()
+        assert len(deduplicator._get_embeddings.call_args.args[0]) == 5
+
+    @patch("app.deduplicator.OpenAI")
+    def test_check_duplicates_batch_texts(self, mock_openai, sample_existing_questions):
+        """Test batch duplicate checking on plain question texts."""
+        texts = [f"Synthetic question {i}?" for i in range(1000)]
+        texts[500] = "what is the capital of france?"  # Exact duplicate
+
+        deduplicator = QuestionDeduplicator(openai_api_key="test-key")
+        rng = np.random.default_rng(0)
+        deduplicator._get_embeddings = Mock(
+            side_effect=lambda batch: rng.standard_normal(
+                (len(batch), 64), dtype=np.float32
+            )
+        )
+
+        results = deduplicator.check_duplicates_batch_texts(
+            texts, sample_existing_questions
+        )
+
+        assert len(results) == 1000
+        assert results[500].duplicate_type == "exact"
+        assert results[500].matched_question["id"] == 1
+        deduplicator._get_embeddings.assert_called_once()
+        assert len(deduplicator._get_embeddings.call_args.args[0]) == 999 + 3
+
     @patch("app.deduplicator.OpenAI")
     def test_cosine_similarity(self, mock_openai):
         """Test cosine similarity calculation."""
@@ -299,13 +550,13 @@ class TestQuestionDeduplicator:
         # Test identical vectors
         vec1 = np.array([1.0, 2.0, 3.0])
         similarity = deduplicator._cosine_similarity(vec1, vec1)
-        assert pytest.approx(similarity, abs=0.01) == 1.0
+        assert abs(similarity - 1.0) < 1e-6
 
         # Test orthogonal vectors
         vec2 = np.array([1.0, 0.0, 0.0])
         vec3 = np.array([0.0, 1.0, 0.0])
         similarity = deduplicator._cosine_similarity(vec2, vec3)
-        assert pytest.approx(similarity, abs=0.01) == 0.0
+        assert abs(similarity) < 1e-6
 
         # Test similar vectors
         vec4 = np.array([1.0, 1.0, 1.0])
@@ -335,8 +586,9 @@ class TestQuestionDeduplicator:
         embedding = deduplicator._get_embedding("Test question")
 
         assert isinstance(embedding, np.ndarray)
+        assert embedding.dtype == np.float32
         assert len(embedding) == 1536
-        assert all(v == 0.1 for v in embedding)
+        assert np.allclose(embedding, 0.1)
 
     @patch("app.deduplicator.OpenAI")
     def test_get_embedding_failure(self, mock_openai):
@@ -349,7 +601,108 @@ class TestQuestionDeduplicator:
             deduplicator._get_embedding("Test question")
 
     @patch("app.deduplicator.OpenAI")
-    def test_filter_duplicates(self, mock_openai, sample_existing_questions):
+    def test_get_embeddings_single_request(self, mock_openai):
+        """Test batched embedding generation uses one API call."""
+        mock_response = Mock()
+        mock_response.data = [
+            Mock(embedding=[0.1] * 1536),
+            Mock(embedding=[0.2] * 1536),
+        ]
+        mock_openai.return_value.embeddings.create.return_value = mock_response
+
+        deduplicator = QuestionDeduplicator(openai_api_key="test-key")
+        embeddings = deduplicator._get_embeddings(["Question 1", "Question 2"])
+
+        mock_openai.return_value.embeddings.create.assert_called_once_with(
+            input=["Question 1", "Question 2"],
+            model="text-embedding-3-small",
+        )
+        assert embeddings.shape == (2, 1536)
+        assert embeddings.dtype == np.float32
+
+    def test_get_embeddings_splits_large_requests(self, mock_embeddings_client):
+        """Test inputs beyond the per-request limit are split across calls."""
+        create = mock_embeddings_client.embeddings.create
+
+        deduplicator = QuestionDeduplicator(openai_api_key="test-key")
+        texts = [f"Question {i}" for i in range(MAX_EMBEDDING_BATCH_SIZE + 10)]
+        embeddings = deduplicator._get_embeddings(texts)
+
+        batch_sizes = [len(c.kwargs["input"]) for c in create.call_args_list]
+        assert batch_sizes == [MAX_EMBEDDING_BATCH_SIZE, 10]
+        assert embeddings.shape == (len(texts), 2)
+
+    def test_get_embeddings_splits_by_token_budget(self, mock_embeddings_client):
+        """Test long inputs are split to stay within the per-request token cap."""
+        create = mock_embeddings_client.embeddings.create
+
+        deduplicator = QuestionDeduplicator(openai_api_key="test-key")
+        long_text = "x" * (MAX_EMBEDDING_BATCH_TOKENS * 3 // 2)
+        deduplicator._get_embeddings([long_text + "a", long_text + "b", "short"])
+
+        batch_sizes = [len(c.kwargs["input"]) for c in create.call_args_list]
+        assert batch_sizes == [1, 2]
+
+    def test_get_embeddings_uses_cache(self, mock_embeddings_client):
+        """Test cached embeddings are not requested from the API again."""
+        create = mock_embeddings_client.embeddings.create
+
+        deduplicator = QuestionDeduplicator(openai_api_key="test-key")
+        first = deduplicator._get_embeddings(["a", "bb"])
+        second = deduplicator._get_embeddings(["bb", "ccc", "a"])
+
+        assert create.call_count == 2
+        assert create.call_args.kwargs["input"] == ["ccc"]
+        assert np.array_equal(second[0], first[1])
+        assert np.array_equal(second[2], first[0])
+        assert second[1][0] == 3.0
+
+    def test_get_embeddings_cache_does_not_keep_batch_alive(
+        self, mock_embeddings_client
+    ):
+        """Test a cached embedding is not a view into the fetched batch."""
+        deduplicator = QuestionDeduplicator(
+            openai_api_key="test-key", embedding_cache_size=1
+        )
+        deduplicator._get_embeddings([f"Question {i}" for i in range(100)])
+
+        (cached,) = deduplicator._embedding_cache.values()
+        assert cached.base is None
+
+    def test_get_embeddings_cache_evicts_least_recently_used(
+        self, mock_embeddings_client
+    ):
+        """Test the embedding cache is bounded by embedding_cache_size."""
+        create = mock_embeddings_client.embeddings.create
+
+        deduplicator = QuestionDeduplicator(
+            openai_api_key="test-key", embedding_cache_size=2
+        )
+        deduplicator._get_embeddings(["a", "b", "c"])
+
+        assert deduplicator.get_stats()["cached_embeddings"] == 2
+        deduplicator._get_embeddings(["a"])
+        assert create.call_count == 2
+
+    @patch("app.deduplicator.OpenAI")
+    def test_check_duplicates_batch_fails_open(
+        self, mock_openai, sample_question, sample_existing_questions
+    ):
+        """Test batch check reports non-duplicates when embeddings fail."""
+        deduplicator = QuestionDeduplicator(openai_api_key="test-key")
+        deduplicator._get_embeddings = Mock(side_effect=Exception("API error"))
+
+        results = deduplicator.check_duplicates_batch(
+            [sample_question], sample_existing_questions
+        )
+
+        assert len(results) == 1
+        assert results[0].is_duplicate is False
+
+    @patch("app.deduplicator.OpenAI")
+    def test_filter_duplicates(
+        self, mock_openai, sample_existing_questions, random_embeddings
+    ):
         """Test filtering duplicates from question list."""
         questions = [
             GeneratedQuestion(
@@ -387,13 +740,8 @@ class TestQuestionDeduplicator:
         deduplicator = QuestionDeduplicator(openai_api_key="test-key")
 
         # Mock embeddings to ensure no semantic matches
-        def get_mock_embedding(seed):
-            np.random.seed(seed)
-            return np.random.rand(1536)
-
-        deduplicator._get_embedding = Mock(
-            side_effect=[get_mock_embedding(i) for i in range(200, 220)]
-        )
+        # 2 non-exact new questions + 3 existing questions in one request
+        deduplicator._get_embeddings = Mock(return_value=random_embeddings[9:14])
 
         unique, duplicates = deduplicator.filter_duplicates(
             questions, sample_existing_questions
@@ -403,6 +751,7 @@ class TestQuestionDeduplicator:
         assert len(duplicates) == 1
         assert duplicates[0][0].question_text == "What is the capital of France?"
         assert duplicates[0][1].is_duplicate is True
+        deduplicator._get_embeddings.assert_called_once()
 
     @patch("app.deduplicator.OpenAI")
     def test_get_stats(self, mock_openai):
@@ -472,7 +821,7 @@ class TestDeduplicatorIntegration:
         vec1 = np.array([1.0, 0.0])
         vec2 = np.array([0.85, np.sqrt(1 - 0.85**2)])  # Cosine similarity = 0.85
 
-        deduplicator._get_embedding = Mock(side_effect=[vec1, vec2])
+        deduplicator._get_embeddings = Mock(return_value=np.vstack([vec1, vec2]))
 
         result = deduplicator.check_duplicate(question, existing)
 
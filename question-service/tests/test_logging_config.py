@@ -1,13 +1,19 @@
 """Tests for logging configuration module."""
 
-import json
+import io
 import logging
 import tempfile
+import threading
 from pathlib import Path
+from unittest.mock import Mock
 
+import orjson
 import pytest
 
 from app.logging_config import (
+    BufferedFileHandler,
+    BytesRotatingFileHandler,
+    BytesStreamHandler,
     ColoredFormatter,
     JSONFormatter,
     LogContext,
@@ -16,6 +22,19 @@ from app.logging_config import (
 )
 
 
+def _make_record(msg="Test message"):
+    """Create an INFO record on the "test" logger."""
+    return logging.getLogger("test").makeRecord(
+        name="test",
+        level=logging.INFO,
+        fn="test.py",
+        lno=42,
+        msg=msg,
+        args=(),
+        exc_info=None,
+    )
+
+
 class TestJSONFormatter:
     """Tests for JSONFormatter class."""
 
@@ -36,7 +55,7 @@ class TestJSONFormatter:
         )
 
         formatted = formatter.format(record)
-        parsed = json.loads(formatted)
+        parsed = orjson.loads(formatted)
 
         assert parsed["level"] == "INFO"
         assert parsed["logger"] == "test"
@@ -67,13 +86,155 @@ class TestJSONFormatter:
             )
 
         formatted = formatter.format(record)
-        parsed = json.loads(formatted)
+        parsed = orjson.loads(formatted)
 
         assert parsed["level"] == "ERROR"
         assert parsed["message"] == "Error occurred"
         assert "exception" in parsed
         assert "ValueError" in parsed["exception"]
 
+    def test_format_bytes(self):
+        """Test formatting a record directly to UTF-8 JSON bytes."""
+        formatter = JSONFormatter()
+        logger = logging.getLogger("test")
+
+        record = logger.makeRecord(
+            name="test",
+            level=logging.INFO,
+            fn="test.py",
+            lno=42,
+            msg="Caf\u00e9 message",
+            args=(),
+            exc_info=None,
+        )
+
+        formatted = formatter.format_bytes(record)
+
+        assert isinstance(formatted, bytes)
+        assert orjson.loads(formatted)["message"] == "Caf\u00e9 message"
+        assert isinstance(formatter.format(record), str)
+
+
+class TestBytesRotatingFileHandler:
+    """Tests for BytesRotatingFileHandler class."""
+
+    def test_emit_writes_json_lines(self):
+        """Test that records are written as newline-delimited JSON."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir) / "test.log"
+            handler = BytesRotatingFileHandler(str(log_file))
+            handler.setFormatter(JSONFormatter())
+
+            handler.emit(_make_record("First"))
+            handler.emit(_make_record("Second"))
+            handler.close()
+
+            lines = log_file.read_text().splitlines()
+            assert [orjson.loads(line)["message"] for line in lines] == [
+                "First",
+                "Second",
+            ]
+
+    def test_emit_rotates_file(self):
+        """Test that the file is rotated once it would exceed maxBytes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir) / "test.log"
+            handler = BytesRotatingFileHandler(
+                str(log_file), maxBytes=200, backupCount=1
+            )
+            handler.setFormatter(JSONFormatter())
+
+            handler.emit(_make_record("First"))
+            handler.emit(_make_record("Second"))
+            handler.close()
+
+            assert orjson.loads(log_file.read_text())["message"] == "Second"
+            backup = Path(f"{log_file}.1")
+            assert orjson.loads(backup.read_text())["message"] == "First"
+
+    def test_emit_batch_rotates_within_batch(self):
+        """Test that a batch is split across files where rotation is needed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir) / "test.log"
+            handler = BytesRotatingFileHandler(
+                str(log_file), maxBytes=200, backupCount=1
+            )
+            handler.setFormatter(JSONFormatter())
+
+            handler.emit_batch([_make_record("First"), _make_record("Second")])
+            handler.close()
+
+            assert orjson.loads(log_file.read_text())["message"] == "Second"
+            backup = Path(f"{log_file}.1")
+            assert orjson.loads(backup.read_text())["message"] == "First"
+
+
+class TestBufferedFileHandler:
+    """Tests for BufferedFileHandler class."""
+
+    def test_flush_writes_buffer_once(self):
+        """Test that buffered records reach the file in one write and flush."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir) / "test.log"
+            target = BytesRotatingFileHandler(str(log_file))
+            target.setFormatter(JSONFormatter())
+            target.stream = Mock(wraps=target.stream)
+            handler = BufferedFileHandler(capacity=1000, target=target)
+
+            for i in range(100):
+                handler.handle(_make_record(f"Message {i}"))
+            handler.flush()
+
+            assert target.stream.write.call_count == 1
+            assert target.stream.flush.call_count == 1
+            handler.close()
+            target.close()
+
+            lines = log_file.read_text().splitlines()
+            assert len(lines) == 100
+            assert orjson.loads(lines[-1])["message"] == "Message 99"
+
+
+class TestBytesStreamHandler:
+    """Tests for BytesStreamHandler class."""
+
+    def test_emit_writes_to_binary_buffer(self):
+        """Test that JSON records are written in order with pending text output."""
+        raw = io.BytesIO()
+        stream = io.TextIOWrapper(raw, encoding="utf-8")
+        handler = BytesStreamHandler(stream)
+        handler.setFormatter(JSONFormatter())
+        handler.terminator = "\r\n"
+
+        stream.write("before\n")
+        handler.emit(_make_record("Caf\u00e9 message"))
+
+        before, record_line = raw.getvalue().split(b"\n", 1)
+        assert before == b"before"
+        assert record_line.endswith(b"\r\n")
+        assert orjson.loads(record_line)["message"] == "Caf\u00e9 message"
+
+    def test_emit_writes_non_json_records_as_text(self):
+        """Test that other formatters go through the standard text write."""
+        raw = io.BytesIO()
+        stream = io.TextIOWrapper(raw, encoding="utf-8")
+        handler = BytesStreamHandler(stream)
+        handler.setFormatter(ColoredFormatter("%(levelname)s - %(message)s"))
+
+        handler.emit(_make_record("Test message"))
+
+        assert raw.getvalue() == b"\033[32mINFO\033[0m - Test message\n"
+
+    def test_emit_falls_back_to_text_stream(self):
+        """Test that streams without a binary buffer get str writes."""
+        stream = io.StringIO()
+        handler = BytesStreamHandler(stream)
+        handler.setFormatter(JSONFormatter())
+
+        handler.emit(_make_record("Test message"))
+
+        assert orjson.loads(stream.getvalue())["message"] == "Test message"
+
 
 class TestColoredFormatter:
     """Tests for ColoredFormatter class."""
@@ -138,6 +299,14 @@ class TestSetupLogging:
         assert root_logger.level == logging.INFO
         assert len(root_logger.handlers) > 0
 
+    def test_setup_logging_console_handler_by_format(self):
+        """Test that only JSON console output uses the bytes handler."""
+        setup_logging(log_level="INFO", enable_file_logging=False)
+        assert type(logging.getLogger().handlers[0]) is logging.StreamHandler
+
+        setup_logging(log_level="INFO", json_format=True, enable_file_logging=False)
+        assert isinstance(logging.getLogger().handlers[0], BytesStreamHandler)
+
     def test_setup_logging_with_file(self):
         """Test setting up logging with file output."""
         logging.getLogger().handlers.clear()
@@ -154,8 +323,10 @@ class TestSetupLogging:
             root_logger = logging.getLogger()
             assert root_logger.level == logging.DEBUG
 
-            # Log a test message
+            # Log a test message and flush buffered file records
             root_logger.info("Test message")
+            for handler in root_logger.handlers:
+                handler.flush()
 
             # Check that log file was created
             assert log_file.exists()
@@ -164,6 +335,107 @@ class TestSetupLogging:
             content = log_file.read_text()
             assert len(content) > 0
 
+    def test_setup_logging_buffers_file_records(self):
+        """Test that file records are batched until flushed or an error occurs."""
+        logging.getLogger().handlers.clear()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir) / "test.log"
+
+            setup_logging(
+                log_level="INFO",
+                log_file=str(log_file),
+                enable_file_logging=True,
+                buffer_capacity=100,
+            )
+
+            root_logger = logging.getLogger()
+            root_logger.info("Buffered message")
+            assert log_file.read_text() == ""
+
+            root_logger.error("Error message")
+            messages = [
+                orjson.loads(line)["message"]
+                for line in log_file.read_text().splitlines()
+            ]
+            assert "Buffered message" in messages
+            assert messages[-1] == "Error message"
+
+            for handler in root_logger.handlers:
+                handler.close()
+            root_logger.handlers.clear()
+
+    def test_setup_logging_unbuffered_file(self):
+        """Test that buffer_capacity=0 writes file records immediately."""
+        logging.getLogger().handlers.clear()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir) / "test.log"
+
+            setup_logging(
+                log_level="INFO",
+                log_file=str(log_file),
+                enable_file_logging=True,
+                buffer_capacity=0,
+            )
+
+            root_logger = logging.getLogger()
+            root_logger.info("Immediate message")
+            assert "Immediate message" in log_file.read_text()
+
+            for handler in root_logger.handlers:
+                handler.close()
+            root_logger.handlers.clear()
+
+    def test_setup_logging_reuses_file_handler(self):
+        """Test that repeated setup reuses the cached file handler."""
+        logging.getLogger().handlers.clear()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = str(Path(tmpdir) / "test.log")
+            root_logger = logging.getLogger()
+
+            setup_logging(log_level="INFO", log_file=log_file, buffer_capacity=0)
+            file_handler = root_logger.handlers[-1]
+
+            setup_logging(log_level="DEBUG", log_file=log_file, buffer_capacity=0)
+            assert root_logger.handlers[-1] is file_handler
+            assert file_handler.level == logging.DEBUG
+            assert len(root_logger.handlers) == 2
+
+            setup_logging(
+                log_level="INFO", log_file=log_file, buffer_capacity=0, force=True
+            )
+            assert root_logger.handlers[-1] is not file_handler
+            assert file_handler.stream is None
+
+            for handler in root_logger.handlers:
+                handler.close()
+            root_logger.handlers.clear()
+
+    def test_setup_logging_replaces_closed_file_handler(self):
+        """Test that a cached handler closed elsewhere is not reused."""
+        logging.getLogger().handlers.clear()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir) / "test.log"
+            root_logger = logging.getLogger()
+
+            setup_logging(log_level="INFO", log_file=str(log_file))
+            closed_handler = root_logger.handlers[-1]
+            for handler in root_logger.handlers:
+                handler.close()
+
+            setup_logging(log_level="INFO", log_file=str(log_file))
+            assert root_logger.handlers[-1] is not closed_handler
+
+            root_logger.error("After reconfigure")
+            assert "After reconfigure" in log_file.read_text()
+
+            for handler in root_logger.handlers:
+                handler.close()
+            root_logger.handlers.clear()
+
     def test_setup_logging_json_format(self):
         """Test setting up logging with JSON format."""
         logging.getLogger().handlers.clear()
@@ -259,27 +531,70 @@ class TestLogContext:
             assert record.extra["request_id"] == "123"
             assert record.extra["user_id"] == "456"
 
-    def test_log_context_restores_factory(self):
-        """Test that LogContext restores original factory on exit."""
+    def test_log_context_restores_context(self):
+        """Test that LogContext removes its fields on exit."""
+        with LogContext(test_key="test_value"):
+            assert _make_record().extra == {"test_key": "test_value"}
+
+        assert not hasattr(_make_record(), "extra")
+
+    def test_log_context_stores_extra_as_attribute(self):
+        """Test that extra fields are a plain record attribute."""
+        with LogContext(test_key="test_value"):
+            record = _make_record()
+
+        assert record.__dict__["extra"] == {"test_key": "test_value"}
+
+    def test_caller_extra_field_is_kept(self):
+        """Test that an "extra" key passed by the caller reaches the record."""
+        record = get_logger("test").makeRecord(
+            name="test",
+            level=logging.INFO,
+            fn="test.py",
+            lno=42,
+            msg="Test message",
+            args=(),
+            exc_info=None,
+            extra={"extra": {"k": 1}},
+        )
+
+        formatted = orjson.loads(JSONFormatter().format(record))
+        assert formatted["extra"] == {"k": 1}
+
+    def test_log_context_does_not_swap_factory(self):
+        """Test that entering LogContext leaves the global factory in place."""
+        with LogContext(warmup="value"):
+            pass
         original_factory = logging.getLogRecordFactory()
 
         with LogContext(test_key="test_value"):
-            # Factory should be different inside context
-            current_factory = logging.getLogRecordFactory()
-            assert current_factory != original_factory
+            assert logging.getLogRecordFactory() is original_factory
 
-        # Factory should be restored after context
-        restored_factory = logging.getLogRecordFactory()
-        assert restored_factory == original_factory
+        assert logging.getLogRecordFactory() is original_factory
 
     def test_log_context_nested(self):
         """Test that LogContext can be nested."""
-        original_factory = logging.getLogRecordFactory()
-
         with LogContext(outer="value1"):
             with LogContext(inner="value2"):
-                # Inner context should be active
-                pass
+                # Inner context merges with the outer one
+                assert _make_record().extra == {
+                    "outer": "value1",
+                    "inner": "value2",
+                }
+            assert _make_record().extra == {"outer": "value1"}
+
+        assert not hasattr(_make_record(), "extra")
+
+    def test_log_context_isolated_between_threads(self):
+        """Test that context set in one thread does not leak into another."""
+        seen = []
+
+        def log_in_thread():
+            seen.append(hasattr(_make_record(), "extra"))
+
+        with LogContext(request_id="123"):
+            thread = threading.Thread(target=log_in_thread)
+            thread.start()
+            thread.join()
 
-        # Original factory should be restored
-        assert logging.getLogRecordFactory() == original_factory
+        assert seen == [False]
@@ -1,13 +1,21 @@
 """Tests for metrics tracking module."""
 
-import json
+import logging
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
+from unittest.mock import patch
 
+import orjson
 import pytest
 
-from app.metrics import MetricsTracker, get_metrics_tracker, reset_metrics
+from app.error_classifier import ClassifiedError, ErrorCategory, ErrorSeverity
+from app.metrics import (
+    MAX_ERROR_RECORDS,
+    MetricsTracker,
+    get_metrics_tracker,
+    reset_metrics,
+)
 
 
 class TestMetricsTracker:
@@ -48,6 +56,13 @@ class TestMetricsTracker:
         assert tracker.questions_generated == 0
         assert tracker.generation_failures == 0
 
+    def test_uses_slots(self, tracker):
+        """Test that the tracker has a fixed attribute set."""
+        assert not hasattr(tracker, "__dict__")
+
+        with pytest.raises(AttributeError):
+            tracker.questions_requestd = 1
+
     def test_start_and_end_run(self, tracker):
         """Test marking start and end of pipeline run."""
         tracker.start_run()
@@ -71,6 +86,17 @@ class TestMetricsTracker:
         duration = tracker.get_duration_seconds()
         assert duration == 330.0  # 5 minutes 30 seconds
 
+    @patch("app.metrics.time.perf_counter", side_effect=[100.0, 102.5])
+    def test_get_duration_seconds_uses_monotonic_clock(
+        self, mock_perf_counter, tracker
+    ):
+        """Test that run duration comes from the monotonic clock."""
+        tracker.start_run()
+        tracker.end_run()
+
+        assert tracker.get_duration_seconds() == 2.5
+        assert mock_perf_counter.call_count == 2
+
     def test_record_generation_request(self, tracker):
         """Test recording generation requests."""
         tracker.record_generation_request(10)
@@ -112,6 +138,38 @@ class TestMetricsTracker:
         assert error["question_type"] == "logical_reasoning"
         assert "timestamp" in error
 
+    def test_error_records_are_bounded(self, tracker):
+        """Test that only the most recent error records are kept."""
+        total = MAX_ERROR_RECORDS + 10
+        for i in range(total):
+            tracker.record_generation_failure("openai", f"error {i}")
+
+        assert tracker.generation_failures == total
+        assert len(tracker.generation_errors) == MAX_ERROR_RECORDS
+        assert tracker.generation_errors[0]["error"] == "error 10"
+        assert tracker.generation_errors[-1]["error"] == f"error {total - 1}"
+
+        summary = tracker.get_summary()
+        assert summary["generation"]["failed"] == total
+        assert len(summary["generation"]["errors"]) == 10
+
+    @patch("app.metrics._timestamp_cache", (float("-inf"), ""))
+    @patch("app.metrics.datetime")
+    @patch("app.metrics.time.perf_counter", side_effect=[10.0, 10.0005, 10.002])
+    def test_error_timestamps_shared_within_resolution(
+        self, mock_perf_counter, mock_datetime, tracker
+    ):
+        """Test that errors recorded in a burst share one timestamp."""
+        mock_datetime.now.return_value.isoformat.side_effect = ["first", "second"]
+
+        tracker.record_generation_failure("openai", "error 1")
+        tracker.record_evaluation_failure("error 2")
+        tracker.record_insertion_failure("error 3")
+
+        assert tracker.generation_errors[0]["timestamp"] == "first"
+        assert tracker.evaluation_errors[0]["timestamp"] == "first"
+        assert tracker.insertion_errors[0]["timestamp"] == "second"
+
     def test_record_evaluation_success_approved(self, tracker):
         """Test recording successful evaluation with approval."""
         tracker.record_evaluation_success(
@@ -139,6 +197,55 @@ class TestMetricsTracker:
         assert tracker.questions_rejected == 1
         assert 0.65 in tracker.evaluation_scores
 
+    def test_record_success_logs_single_event_details(self, tracker, caplog):
+        """Test that single successes log their details rather than a count."""
+        with caplog.at_level(logging.DEBUG, logger="app.metrics"):
+            tracker.record_generation_success("openai", "mathematical", "easy")
+            tracker.record_evaluation_success(0.85, True, "openai/gpt-4")
+
+        assert "Generation success: openai/mathematical/easy" in caplog.messages
+        assert "Evaluation success: score=0.850, approved=True" in caplog.messages
+
+    def test_record_generation_successes(self, tracker):
+        """Test recording a batch of successful generations."""
+        tracker.record_generation_successes(
+            providers=["openai", "anthropic", "openai"],
+            question_types=["math", "math", "verbal_reasoning"],
+            difficulties=["easy", "hard", "easy"],
+        )
+
+        assert tracker.questions_generated == 3
+        assert tracker.questions_by_provider == {"openai": 2, "anthropic": 1}
+        assert tracker.questions_by_type == {"math": 2, "verbal_reasoning": 1}
+        assert tracker.questions_by_difficulty == {"easy": 2, "hard": 1}
+        assert tracker.total_api_calls == 3
+
+    def test_record_evaluation_successes(self, tracker):
+        """Test recording a batch of successful evaluations."""
+        tracker.record_evaluation_success(0.8, True, "openai/gpt-4")
+        tracker.record_evaluation_successes(
+            scores=[0.9, 0.5],
+            approved=[True, False],
+            arbiter_models=["openai/gpt-4", "anthropic/claude"],
+        )
+
+        assert tracker.questions_evaluated == 3
+        assert tracker.questions_approved == 2
+        assert tracker.questions_rejected == 1
+        assert tracker.evaluation_score_min == 0.5
+        assert tracker.evaluation_score_max == 0.9
+        assert tracker.api_calls_by_provider == {"openai": 2, "anthropic": 1}
+
+    def test_record_successes_length_mismatch(self, tracker):
+        """Test that batch recording rejects lists of different lengths."""
+        with pytest.raises(ValueError):
+            tracker.record_generation_successes(["openai"], ["math"], [])
+        with pytest.raises(ValueError):
+            tracker.record_evaluation_successes([0.9], [True, False], ["openai"])
+
+        assert tracker.questions_generated == 0
+        assert tracker.questions_evaluated == 0
+
     def test_record_evaluation_failure(self, tracker):
         """Test recording failed evaluation."""
         tracker.record_evaluation_failure(
@@ -193,6 +300,7 @@ class TestMetricsTracker:
         """Test recording deduplication failure."""
         tracker.record_deduplication_failure(error="Embedding API failed")
 
+        assert tracker.deduplication_failures == 1
         assert len(tracker.deduplication_errors) == 1
         error = tracker.deduplication_errors[0]
         assert error["error"] == "Embedding API failed"
@@ -241,6 +349,24 @@ class TestMetricsTracker:
         assert gen["requested"] == 10
         assert gen["generated"] == 1
         assert gen["by_provider"]["openai"] == 1
+        assert type(gen["by_provider"]) is dict
+        assert type(summary["api"]["by_provider"]) is dict
+
+    def test_get_summary_is_cached_until_next_record(self, tracker):
+        """Test that the summary is reused until new metrics are recorded."""
+        tracker.record_generation_request(5)
+        summary = tracker.get_summary()
+
+        assert tracker.get_summary() is summary
+
+        tracker.record_generation_success("openai", "math", "easy")
+        updated = tracker.get_summary()
+
+        assert updated is not summary
+        assert updated["generation"]["generated"] == 1
+
+        tracker.end_run()
+        assert tracker.get_summary() is not updated
 
     def test_get_summary_success_rates(self, tracker):
         """Test success rate calculations in summary."""
@@ -285,6 +411,18 @@ class TestMetricsTracker:
         assert eval_stats["min_score"] == 0.7
         assert eval_stats["max_score"] == 0.9
 
+    def test_evaluation_score_statistics_are_running_totals(self, tracker):
+        """Test score statistics cover all scores while only recent ones are kept."""
+        for i in range(2000):
+            tracker.record_evaluation_success(i / 2000, True, "openai/gpt-4")
+
+        summary = tracker.get_summary()
+
+        assert len(tracker.evaluation_scores) == 1024
+        assert summary["evaluation"]["min_score"] == 0.0
+        assert summary["evaluation"]["max_score"] == 1999 / 2000
+        assert summary["evaluation"]["average_score"] == pytest.approx(0.49975)
+
     def test_get_summary_api_usage(self, tracker):
         """Test API usage tracking in summary."""
         tracker.record_generation_success("openai", "pattern", "easy")
@@ -315,8 +453,7 @@ class TestMetricsTracker:
             assert output_file.exists()
 
             # Check content is valid JSON
-            with open(output_file) as f:
-                summary = json.load(f)
+            summary = orjson.loads(output_file.read_bytes())
 
             assert "generation" in summary
             assert summary["generation"]["requested"] == 5
@@ -340,6 +477,29 @@ class TestMetricsTracker:
         assert "Evaluation:" in output
         assert "Requested: 10" in output
         assert "Generated: 1" in output
+        assert "Error Classification:" not in output
+        assert output.endswith("=" * 80 + "\n\n")
+
+    def test_print_summary_with_classified_errors(self, tracker, capsys):
+        """Test that classified errors add their own summary section."""
+        tracker.record_generation_failure(
+            "openai",
+            "quota exceeded",
+            classified_error=ClassifiedError(
+                category=ErrorCategory.BILLING_QUOTA,
+                severity=ErrorSeverity.CRITICAL,
+                provider="openai",
+                original_error="quota exceeded",
+                message="Billing quota exceeded",
+            ),
+        )
+
+        tracker.print_summary()
+
+        output = capsys.readouterr().out
+        assert "Error Classification:" in output
+        assert "Critical Errors:  1" in output
+        assert output.index("Error Classification:") < output.index("Overall:")
 
 
 class TestGlobalMetricsTracker:
@@ -379,24 +539,21 @@ class TestMetricsIntegration:
 
         # Simulate generation phase
         tracker.record_generation_request(20)
-        for i in range(18):
-            tracker.record_generation_success(
-                provider="openai" if i % 2 == 0 else "anthropic",
-                question_type="pattern_recognition",
-                difficulty="easy" if i < 6 else "medium" if i < 12 else "hard",
-            )
+        tracker.record_generation_successes(
+            providers=["openai" if i % 2 == 0 else "anthropic" for i in range(18)],
+            question_types=["pattern_recognition"] * 18,
+            difficulties=["easy"] * 6 + ["medium"] * 6 + ["hard"] * 6,
+        )
         for _ in range(2):
             tracker.record_generation_failure("google", "timeout")
 
         # Simulate evaluation phase
-        for i in range(18):
-            score = 0.75 + (i % 3) * 0.1  # Scores: 0.75, 0.85, 0.95
-            approved = score >= 0.7
-            tracker.record_evaluation_success(
-                score=score,
-                approved=approved,
-                arbiter_model="openai/gpt-4",
-            )
+        scores = [0.75 + (i % 3) * 0.1 for i in range(18)]  # 0.75, 0.85, 0.95
+        tracker.record_evaluation_successes(
+            scores=scores,
+            approved=[score >= 0.7 for score in scores],
+            arbiter_models=["openai/gpt-4"] * 18,
+        )
 
         # Simulate deduplication phase
         for i in range(18):
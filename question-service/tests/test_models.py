@@ -92,47 +92,26 @@ class TestGeneratedQuestion:
         assert question.answer_options is None
         assert question.correct_answer == "Paris"
 
-    def test_to_dict(self):
+    def test_to_dict(self, sample_math_question):
         """Test converting question to dictionary."""
-        question = GeneratedQuestion(
-            question_text="What is 2 + 2?",
-            question_type=QuestionType.MATHEMATICAL,
-            difficulty_level=DifficultyLevel.EASY,
-            correct_answer="4",
-            answer_options=["2", "3", "4", "5"],
-            explanation="Basic addition",
-            metadata={"tag": "test"},
-            source_llm="openai",
-            source_model="gpt-4",
-        )
-
-        result = question.to_dict()
+        result = sample_math_question.to_dict()
 
         assert result["question_text"] == "What is 2 + 2?"
         assert result["question_type"] == "mathematical"
         assert result["difficulty_level"] == "easy"
         assert result["correct_answer"] == "4"
         assert len(result["answer_options"]) == 4
+        assert set(result) == set(type(sample_math_question).model_fields)
 
 
 class TestEvaluationScore:
     """Tests for EvaluationScore model."""
 
-    def test_create_valid_score(self):
+    def test_create_valid_score(self, sample_score):
         """Test creating a valid evaluation score."""
-        score = EvaluationScore(
-            clarity_score=0.9,
-            difficulty_score=0.8,
-            validity_score=0.85,
-            formatting_score=0.95,
-            creativity_score=0.7,
-            overall_score=0.84,
-            feedback="Good question overall",
-        )
-
-        assert score.clarity_score == 0.9
-        assert score.overall_score == 0.84
-        assert score.feedback == "Good question overall"
+        assert sample_score.clarity_score == 0.9
+        assert sample_score.overall_score == 0.84
+        assert sample_score.feedback == "Good question overall"
 
     def test_score_bounds(self):
         """Test that scores must be between 0.0 and 1.0."""
@@ -162,30 +141,11 @@ class TestEvaluationScore:
 class TestEvaluatedQuestion:
     """Tests for EvaluatedQuestion model."""
 
-    def test_create_evaluated_question(self):
+    def test_create_evaluated_question(self, sample_math_question, sample_score):
         """Test creating an evaluated question."""
-        question = GeneratedQuestion(
-            question_text="What is 2 + 2?",
-            question_type=QuestionType.MATHEMATICAL,
-            difficulty_level=DifficultyLevel.EASY,
-            correct_answer="4",
-            answer_options=["2", "3", "4", "5"],
-            source_llm="openai",
-            source_model="gpt-4",
-        )
-
-        score = EvaluationScore(
-            clarity_score=0.9,
-            difficulty_score=0.8,
-            validity_score=0.85,
-            formatting_score=0.95,
-            creativity_score=0.7,
-            overall_score=0.84,
-        )
-
         evaluated = EvaluatedQuestion(
-            question=question,
-            evaluation=score,
+            question=sample_math_question,
+            evaluation=sample_score,
             arbiter_model="gpt-4-turbo",
             approved=True,
         )
@@ -198,17 +158,13 @@ class TestEvaluatedQuestion:
 class TestGenerationBatch:
     """Tests for GenerationBatch model."""
 
-    def test_create_batch(self):
+    def test_create_batch(self, trusted_question):
         """Test creating a generation batch."""
         questions = [
-            GeneratedQuestion(
+            trusted_question(
                 question_text=f"Question {i}?",
-                question_type=QuestionType.MATHEMATICAL,
-                difficulty_level=DifficultyLevel.EASY,
                 correct_answer=str(i),
                 answer_options=[str(i), str(i + 1), str(i + 2)],
-                source_llm="openai",
-                source_model="gpt-4",
             )
             for i in range(5)
         ]
@@ -237,3 +193,32 @@ class TestGenerationBatch:
 
         assert len(batch) == 0
         assert batch.batch_size == 0
+
+    def test_partial_batch_length(self, trusted_question):
+        """Test that length counts generated questions, not the requested size."""
+        batch = GenerationBatch(
+            questions=[trusted_question(), trusted_question()],
+            question_type=QuestionType.MATHEMATICAL,
+            batch_size=5,
+            generation_timestamp="2024-01-01T00:00:00",
+        )
+
+        assert len(batch) == 2
+        assert batch.batch_size == 5
+
+
+class TestPackageExports:
+    """Tests for the lazily loaded app package exports."""
+
+    def test_importing_models_does_not_load_pipeline(self, assert_import_isolated):
+        """Test that importing app.models does not import the pipeline."""
+        assert_import_isolated("app.models", "app.pipeline")
+
+    def test_exports_resolve_on_access(self):
+        """Test that package exports load their modules on first access."""
+        import app
+        from app.database import DatabaseService
+
+        assert app.QuestionDatabase is DatabaseService
+        with pytest.raises(AttributeError):
+            app.NotAnExport
@@ -1,23 +1,41 @@
 """Tests for question generation pipeline."""
 
+from dataclasses import dataclass
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 import pytest
 
-from app.models import DifficultyLevel, GenerationBatch, QuestionType
+from app.models import DifficultyLevel, QuestionType
 from app.pipeline import QuestionGenerationPipeline, create_pipeline
 
 
+@dataclass(slots=True)
+class _StubQuestion:
+    """Minimal stand-in for GeneratedQuestion with the fields the pipeline reads."""
+
+    source_llm: str = "openai"
+    question_type: QuestionType = QuestionType.MATHEMATICAL
+    difficulty_level: DifficultyLevel = DifficultyLevel.EASY
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mock_generator_class():
+    """Patch QuestionGenerator once for all tests in this module."""
+    with patch("app.generator.QuestionGenerator") as mock:
+        yield mock
+
+
 class TestQuestionGenerationPipeline:
     """Tests for QuestionGenerationPipeline class."""
 
     @pytest.fixture
-    def mock_generator(self):
+    def mock_generator(self, mock_generator_class):
         """Mock QuestionGenerator."""
-        with patch("app.pipeline.QuestionGenerator") as mock:
-            generator = Mock()
-            mock.return_value = generator
-            yield generator
+        mock_generator_class.reset_mock()
+        generator = Mock()
+        mock_generator_class.return_value = generator
+        return generator
 
     @pytest.fixture
     def pipeline(self, mock_generator):
@@ -50,8 +68,7 @@ class TestQuestionGenerationPipeline:
     def test_generate_questions(self, pipeline, mock_generator):
         """Test generating questions through pipeline."""
         # Mock batch return
-        mock_batch = Mock(spec=GenerationBatch)
-        mock_batch.questions = []
+        mock_batch = SimpleNamespace(questions=[])
         mock_generator.generate_batch.return_value = mock_batch
 
         result = pipeline.generate_questions(
@@ -72,8 +89,7 @@ class TestQuestionGenerationPipeline:
 
     def test_generate_questions_without_distribution(self, pipeline, mock_generator):
         """Test generating questions without provider distribution."""
-        mock_batch = Mock(spec=GenerationBatch)
-        mock_batch.questions = []
+        mock_batch = SimpleNamespace(questions=[])
         mock_generator.generate_batch.return_value = mock_batch
 
         pipeline.generate_questions(
@@ -90,8 +106,7 @@ class TestQuestionGenerationPipeline:
     def test_generate_full_question_set(self, pipeline, mock_generator):
         """Test generating full question set."""
         # Mock successful batch generation
-        mock_batch = Mock(spec=GenerationBatch)
-        mock_batch.questions = [Mock() for _ in range(5)]
+        mock_batch = SimpleNamespace(questions=[_StubQuestion() for _ in range(5)])
         mock_generator.generate_batch.return_value = mock_batch
 
         results = pipeline.generate_full_question_set(questions_per_type=5)
@@ -106,8 +121,7 @@ class TestQuestionGenerationPipeline:
     def test_generate_full_question_set_with_failures(self, pipeline, mock_generator):
         """Test full set generation with some failures."""
         # Mock to succeed on first call, fail on second
-        mock_batch = Mock(spec=GenerationBatch)
-        mock_batch.questions = [Mock()]
+        mock_batch = SimpleNamespace(questions=[_StubQuestion()])
 
         mock_generator.generate_batch.side_effect = [
             mock_batch,
@@ -120,19 +134,35 @@ class TestQuestionGenerationPipeline:
         # Should have results despite one failure
         assert len(results) > 0
 
-    def test_run_generation_job(self, pipeline, mock_generator):
+    @pytest.mark.parametrize(
+        "job_kwargs",
+        [
+            {"questions_per_run": 30},
+            {
+                "questions_per_run": 10,
+                "question_types": [
+                    QuestionType.MATHEMATICAL,
+                    QuestionType.LOGICAL_REASONING,
+                ],
+            },
+            {
+                "questions_per_run": 20,
+                "difficulty_distribution": {
+                    DifficultyLevel.EASY: 0.5,
+                    DifficultyLevel.MEDIUM: 0.3,
+                    DifficultyLevel.HARD: 0.2,
+                },
+            },
+        ],
+        ids=["default", "custom_types", "custom_distribution"],
+    )
+    def test_run_generation_job(self, pipeline, mock_generator, job_kwargs):
         """Test running a complete generation job."""
         # Mock successful batch generation
-        mock_batch = Mock(spec=GenerationBatch)
-        mock_question = Mock()
-        mock_question.source_llm = "openai"
-        mock_question.question_type = QuestionType.MATHEMATICAL
-        mock_question.difficulty_level = DifficultyLevel.EASY
-        mock_batch.questions = [mock_question] * 5
-
+        mock_batch = SimpleNamespace(questions=[_StubQuestion()] * 5)
         mock_generator.generate_batch.return_value = mock_batch
 
-        result = pipeline.run_generation_job(questions_per_run=30)
+        result = pipeline.run_generation_job(**job_kwargs)
 
         # Verify result structure
         assert "statistics" in result
@@ -143,45 +173,20 @@ class TestQuestionGenerationPipeline:
         assert "start_time" in stats
         assert "end_time" in stats
         assert "duration_seconds" in stats
-        assert "target_questions" in stats
-        assert "questions_generated" in stats
+        assert stats["target_questions"] == job_kwargs["questions_per_run"]
         assert "success_rate" in stats
-
-    def test_run_generation_job_with_custom_types(self, pipeline, mock_generator):
-        """Test job with specific question types."""
-        mock_batch = Mock(spec=GenerationBatch)
-        mock_batch.questions = [Mock()]
-        mock_generator.generate_batch.return_value = mock_batch
-
-        result = pipeline.run_generation_job(
-            questions_per_run=10,
-            question_types=[QuestionType.MATHEMATICAL, QuestionType.LOGICAL_REASONING],
+        assert stats["providers_used"] == ["openai"]
+        assert stats["questions_by_type"]["mathematical"] == (
+            stats["questions_generated"]
         )
 
-        # Should only generate for specified types
-        assert len(result["batches"]) > 0
-
-    def test_run_generation_job_with_custom_distribution(
-        self, pipeline, mock_generator
-    ):
-        """Test job with custom difficulty distribution."""
-        mock_batch = Mock(spec=GenerationBatch)
-        mock_batch.questions = [Mock()]
-        mock_generator.generate_batch.return_value = mock_batch
-
-        custom_distribution = {
-            DifficultyLevel.EASY: 0.5,
-            DifficultyLevel.MEDIUM: 0.3,
-            DifficultyLevel.HARD: 0.2,
+        # Should only generate for the requested types
+        requested_types = set(job_kwargs.get("question_types", QuestionType))
+        generated_types = {
+            call.kwargs["question_type"]
+            for call in mock_generator.generate_batch.call_args_list
         }
-
-        result = pipeline.run_generation_job(
-            questions_per_run=20,
-            difficulty_distribution=custom_distribution,
-        )
-
-        # Job should complete successfully
-        assert "statistics" in result
+        assert generated_types == requested_types
 
     def test_get_pipeline_info(self, pipeline, mock_generator):
         """Test getting pipeline information."""
@@ -199,9 +204,9 @@ class TestQuestionGenerationPipeline:
 class TestCreatePipeline:
     """Tests for create_pipeline factory function."""
 
-    @patch("app.pipeline.QuestionGenerationPipeline")
-    def test_create_pipeline_with_keys(self, mock_pipeline_class):
+    def test_create_pipeline_with_keys(self, mocker):
         """Test creating pipeline with API keys."""
+        mock_pipeline_class = mocker.patch("app.pipeline.QuestionGenerationPipeline")
         mock_pipeline = Mock()
         mock_pipeline_class.return_value = mock_pipeline
 
@@ -220,9 +225,9 @@ class TestCreatePipeline:
 
         assert result == mock_pipeline
 
-    @patch("app.pipeline.QuestionGenerationPipeline")
-    def test_create_pipeline_without_keys(self, mock_pipeline_class):
+    def test_create_pipeline_without_keys(self, mocker):
         """Test creating pipeline without explicit keys."""
+        mock_pipeline_class = mocker.patch("app.pipeline.QuestionGenerationPipeline")
         mock_pipeline = Mock()
         mock_pipeline_class.return_value = mock_pipeline
 
@@ -236,3 +241,11 @@ class TestCreatePipeline:
         )
 
         assert result == mock_pipeline
+
+
+class TestPipelineImport:
+    """Tests for pipeline module import behaviour."""
+
+    def test_import_does_not_load_generator(self, assert_import_isolated):
+        """Test that importing app.pipeline defers loading the generator."""
+        assert_import_isolated("app.pipeline", "app.generator")
@@ -1,14 +1,34 @@
 """Tests for prompt generation."""
 
+import re
+from unittest.mock import patch
+
+import pytest
+
 from app.models import DifficultyLevel, QuestionType
 from app.prompts import (
     build_generation_prompt,
+    build_generation_prompts_bulk,
     build_arbiter_prompt,
     QUESTION_TYPE_PROMPTS,
     DIFFICULTY_INSTRUCTIONS,
 )
 
 
+# Enum members, materialized once for the tests that iterate them
+_QUESTION_TYPES = tuple(QuestionType)
+_DIFFICULTIES = tuple(DifficultyLevel)
+
+# Evaluation criteria the arbiter prompt must cover, matched in one scan
+_CRITERIA = ("clarity", "difficulty", "validity", "formatting", "creativity")
+_CRITERIA_RE = re.compile("|".join(_CRITERIA), re.IGNORECASE)
+
+
+def _enum_id(member):
+    """Use the enum value as the parametrized test id."""
+    return member.value
+
+
 class TestBuildGenerationPrompt:
     """Tests for build_generation_prompt function."""
 
@@ -19,11 +39,12 @@ class TestBuildGenerationPrompt:
             difficulty=DifficultyLevel.EASY,
             count=1,
         )
+        prompt_lower = prompt.lower()
 
-        assert "mathematical" in prompt.lower()
-        assert "easy" in prompt.lower()
+        assert "mathematical" in prompt_lower
+        assert "easy" in prompt_lower
         assert "Generate 1 unique" in prompt
-        assert "psychometrician" in prompt.lower()
+        assert "psychometrician" in prompt_lower
         assert "JSON" in prompt
 
     def test_build_multiple_questions_prompt(self):
@@ -33,47 +54,88 @@ class TestBuildGenerationPrompt:
             difficulty=DifficultyLevel.HARD,
             count=5,
         )
+        prompt_lower = prompt.lower()
 
-        assert "logical_reasoning" in prompt.lower()
-        assert "hard" in prompt.lower()
+        assert "logical_reasoning" in prompt_lower
+        assert "hard" in prompt_lower
         assert "Generate 5 unique" in prompt
-        assert "array of question objects" in prompt.lower()
+        assert "array of question objects" in prompt_lower
 
     def test_prompt_contains_type_specific_instructions(self):
         """Test that prompt contains type-specific instructions."""
-        for question_type in QuestionType:
-            prompt = build_generation_prompt(
-                question_type=question_type,
-                difficulty=DifficultyLevel.MEDIUM,
-                count=1,
-            )
+        prompts = build_generation_prompts_bulk(
+            [
+                (question_type, DifficultyLevel.MEDIUM, 1)
+                for question_type in _QUESTION_TYPES
+            ]
+        )
 
+        for (question_type, _, _), prompt in prompts.items():
             # Should contain the type-specific prompt
             assert question_type.value in prompt.lower()
+            assert QUESTION_TYPE_PROMPTS[question_type] in prompt
 
-    def test_prompt_contains_difficulty_instructions(self):
+    @pytest.mark.parametrize("difficulty", _DIFFICULTIES, ids=_enum_id)
+    def test_prompt_contains_difficulty_instructions(self, difficulty):
         """Test that prompt contains difficulty-specific instructions."""
-        for difficulty in DifficultyLevel:
-            prompt = build_generation_prompt(
-                question_type=QuestionType.MATHEMATICAL,
-                difficulty=difficulty,
-                count=1,
-            )
+        prompt = build_generation_prompt(
+            question_type=QuestionType.MATHEMATICAL,
+            difficulty=difficulty,
+            count=1,
+        )
 
-            # Should contain the difficulty level
-            assert difficulty.value in prompt.lower()
+        # Should contain the difficulty level
+        assert difficulty.value in prompt.lower()
 
     def test_all_question_types_have_prompts(self):
         """Test that all question types have prompt templates."""
-        for question_type in QuestionType:
-            assert question_type in QUESTION_TYPE_PROMPTS
-            assert len(QUESTION_TYPE_PROMPTS[question_type]) > 0
+        missing = set(_QUESTION_TYPES) - QUESTION_TYPE_PROMPTS.keys()
+
+        assert not missing
+        assert all(QUESTION_TYPE_PROMPTS.values())
+
+    def test_build_generation_prompt_is_cached(self):
+        """Test that identical prompt specs reuse the cached prompt."""
+        first = build_generation_prompt(QuestionType.MEMORY, DifficultyLevel.HARD, 2)
+        second = build_generation_prompt(QuestionType.MEMORY, DifficultyLevel.HARD, 2)
+
+        assert second is first
+
+    def test_system_prompt_braces_are_literal(self):
+        """Test that braces in the system prompt are not format fields."""
+        system_prompt = 'Example: {"question_text": "..."}'
+        build_generation_prompt.cache_clear()
+        try:
+            with patch("app.prompts.SYSTEM_PROMPT", system_prompt):
+                prompt = build_generation_prompt(
+                    QuestionType.MEMORY, DifficultyLevel.EASY
+                )
+        finally:
+            build_generation_prompt.cache_clear()
+
+        assert prompt.startswith(system_prompt)
+
+    def test_build_generation_prompts_bulk(self):
+        """Test that bulk prompts match individually built prompts."""
+        specs = [
+            (question_type, difficulty, count)
+            for question_type in _QUESTION_TYPES
+            for difficulty in _DIFFICULTIES
+            for count in (1, 3)
+        ]
+
+        prompts = build_generation_prompts_bulk(specs)
+
+        assert list(prompts) == specs
+        for spec, prompt in prompts.items():
+            assert prompt == build_generation_prompt(*spec)
 
     def test_all_difficulties_have_instructions(self):
         """Test that all difficulty levels have instructions."""
-        for difficulty in DifficultyLevel:
-            assert difficulty in DIFFICULTY_INSTRUCTIONS
-            assert len(DIFFICULTY_INSTRUCTIONS[difficulty]) > 0
+        missing = set(_DIFFICULTIES) - DIFFICULTY_INSTRUCTIONS.keys()
+
+        assert not missing
+        assert all(DIFFICULTY_INSTRUCTIONS.values())
 
 
 class TestBuildArbiterPrompt:
@@ -88,13 +150,14 @@ class TestBuildArbiterPrompt:
             question_type="mathematical",
             difficulty="easy",
         )
+        prompt_lower = prompt.lower()
 
         assert "What is 2 + 2?" in prompt
         assert "4" in prompt
         assert "mathematical" in prompt
         assert "easy" in prompt
-        assert "clarity" in prompt.lower()
-        assert "validity" in prompt.lower()
+        assert "clarity" in prompt_lower
+        assert "validity" in prompt_lower
         assert "JSON" in prompt
 
     def test_arbiter_prompt_includes_all_options(self):
@@ -108,8 +171,7 @@ class TestBuildArbiterPrompt:
             difficulty="medium",
         )
 
-        for option in options:
-            assert option in prompt
+        assert all(option in prompt for option in options)
 
     def test_arbiter_prompt_includes_evaluation_criteria(self):
         """Test that arbiter prompt includes all evaluation criteria."""
@@ -121,9 +183,8 @@ class TestBuildArbiterPrompt:
             difficulty="hard",
         )
 
-        criteria = ["clarity", "difficulty", "validity", "formatting", "creativity"]
-        for criterion in criteria:
-            assert criterion.lower() in prompt.lower()
+        found = {match.lower() for match in _CRITERIA_RE.findall(prompt)}
+        assert found == set(_CRITERIA)
 
     def test_arbiter_prompt_specifies_score_range(self):
         """Test that arbiter prompt specifies valid score range."""